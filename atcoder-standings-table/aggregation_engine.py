@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: aggregation_engine.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - AggregationEngine computes several rankings of the same contests at once
+    (generate_best_standings.py --aggregations). The columns of each filtered
+    contest (ContestStandings, sharing one UsernameTable) are scattered once into
+    (users x contests) NumPy matrices, and every aggregation is computed from them:
+    - max:         best TotalScore and its contest (the same as BestScoreAggregator in standings_aggregate.py)
+    - sum_best:K:  sum of the best K TotalScores
+    - average:     average TotalScore of the contests the user took part in
+    - coverage:    solved tasks / all the tasks of the contests
+  - The first aggregation orders the ranking ("Rank"); each of the others has its own
+    min rank ("{key}Rank"). Ties share the smallest rank, as in BestScoreAggregator.
+  - generate_best_standings.py imports this module only with --aggregations (numpy).
+"""
+import numpy as np
+
+class MaxScore:
+    key = "TotalScore"
+    label = "総得点（最大値）"
+
+    def compute(self, matrix):
+        #----- return (values to rank, {field: list}); earlier contests win ties (argmax returns the first) -----#
+        scores = np.where(matrix.participated, matrix.scores, -1)
+        contest_numbers = scores.argmax(axis = 1)
+        best_scores = scores.max(axis = 1, initial = -1)
+        return best_scores, {"TotalScore": [str(score) for score in best_scores.tolist()],
+                             "ContestId": [str(matrix.contests_id[number]) for number in contest_numbers.tolist()]}
+
+    def display(self, user):
+        return user[self.key]
+
+class SumOfBest:
+    def __init__(self, best_number):
+        self.best_number = best_number
+        self.key = f"SumBest{best_number}"
+        self.label = f"総得点（上位{best_number}回の合計）"
+
+    def compute(self, matrix):
+        scores = np.where(matrix.participated, matrix.scores, 0)
+        sums = -np.sort(-scores, axis = 1)[:, :self.best_number].sum(axis = 1)
+        return sums, {self.key: sums.tolist()}
+
+    def display(self, user):
+        return user[self.key]
+
+class AverageScore:
+    key = "Average"
+    label = "平均点"
+
+    def compute(self, matrix):
+        participations = matrix.participated.sum(axis = 1)
+        averages = np.round(np.where(matrix.participated, matrix.scores, 0).sum(axis = 1) / np.maximum(participations, 1), 1)    # ranked as displayed
+        return averages, {self.key: averages.tolist(), "Participations": participations.tolist()}
+
+    def display(self, user):
+        return f"{user[self.key]:.1f}"
+
+class Coverage:
+    key = "Solved"
+    label = "正解数"
+
+    def compute(self, matrix):
+        solved_numbers = matrix.solved_numbers.sum(axis = 1)
+        tasks_number = int(matrix.tasks_numbers.sum())
+        coverages = np.round(solved_numbers / max(tasks_number, 1), 3)
+        return solved_numbers, {self.key: solved_numbers.tolist(), "Coverage": coverages.tolist(), "Tasks": [tasks_number] * len(solved_numbers)}
+
+    def display(self, user):
+        return f'{user[self.key]}/{user["Tasks"]}'
+
+aggregation_types = {"max": MaxScore, "sum_best": SumOfBest, "average": AverageScore, "coverage": Coverage}
+
+def parse_aggregation(spec):
+    #----- "max", "sum_best:3", "average", "coverage" -> aggregation -----#
+    name, _, argument = spec.partition(":")
+    if name not in aggregation_types:
+        raise ValueError(f"unknown aggregation: {spec}")
+    if name == "sum_best":
+        if not argument.isdigit() or int(argument) < 1:
+            raise ValueError(f"sum_best needs the number of contests, e.g. sum_best:3 ({spec})")
+        return SumOfBest(int(argument))
+    return aggregation_types[name]()
+
+def min_ranks(values, usernames):
+    #----- return (order, ranks): order by value (descending) and then by UserName, ties share the smallest rank -----#
+    order = np.lexsort((usernames, -values))
+    sorted_values = values[order]
+    is_new = np.ones(len(order), dtype = bool)
+    is_new[1:] = sorted_values[1:] != sorted_values[:-1]
+    ranks = np.empty(len(order), dtype = np.int64)
+    ranks[order] = np.maximum.accumulate(np.where(is_new, np.arange(1, len(order) + 1), 0))
+    return order, ranks
+
+class ContestMatrix:
+    """Results of several contests as (users x contests) matrices (rows: sorted user IDs)."""
+
+    def __init__(self, contests):
+        self.contests_id = [contest_id for contest_id, _, _ in contests]
+        user_ids = [np.frombuffer(standings.user_ids, dtype = np.int32) for _, standings, _ in contests]
+        self.user_ids = np.unique(np.concatenate(user_ids)) if user_ids else np.empty(0, dtype = np.int32)
+        shape = (len(self.user_ids), len(contests))
+        self.scores = np.zeros(shape, dtype = np.int64)    # TotalScore (points)
+        self.participated = np.zeros(shape, dtype = bool)
+        self.solved_numbers = np.zeros(shape, dtype = np.int64)
+        self.tasks_numbers = np.array([tasks_number for _, _, tasks_number in contests], dtype = np.int64)
+        for column, ((_, standings, _), contest_user_ids) in enumerate(zip(contests, user_ids)):
+            rows = np.searchsorted(self.user_ids, contest_user_ids)
+            self.scores[rows, column] = np.trunc(np.frombuffer(standings.total_scores, dtype = np.int64) / 100)    # as int(score / 100)
+            self.participated[rows, column] = True
+            self.solved_numbers[rows, column] = np.frombuffer(standings.solved_numbers, dtype = np.int32)
+
+class AggregationEngine:
+    def __init__(self, aggregations):
+        self.aggregations = aggregations    # the first one orders the ranking
+        self.contests = []    # (contest ID, ContestStandings, number of tasks)
+
+    def add_contest(self, contest_id, standings, tasks_number):
+        self.contests.append((contest_id, standings, tasks_number))
+
+    def ranking(self, usernames):
+        """Return [{"UserName", <fields of the first aggregation>, "Rank", <fields and "{key}Rank" of the others>}]
+        sorted by Rank and then by UserName. `usernames`: the UsernameTable shared by the contests."""
+        matrix = ContestMatrix(self.contests)
+        names = np.array([usernames[user_id] for user_id in matrix.user_ids.tolist()], dtype = str)
+        results = []
+        for aggregation in self.aggregations:
+            values, fields = aggregation.compute(matrix)
+            order, ranks = min_ranks(values, names)
+            results.append((aggregation, fields, order, ranks.tolist()))
+
+        (primary, primary_fields, primary_order, primary_ranks), *others = results
+        userinfo_list = []
+        for row in primary_order.tolist():
+            user = {"UserName": str(names[row])}
+            user.update((field, values[row]) for field, values in primary_fields.items())
+            user["Rank"] = primary_ranks[row]
+            for aggregation, fields, _, ranks in others:
+                user.update((field, values[row]) for field, values in fields.items())
+                user[f"{aggregation.key}Rank"] = ranks[row]
+            userinfo_list.append(user)
+        return userinfo_list
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: atcoder_session.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Log in to AtCoder and reuse the logged-in session across runs.
+  - The cookies of the session are saved in an encrypted file (Fernet, requires
+    cryptography). Before a saved session is used, it is validated cheaply:
+    the expiry (_TS) and the user name in the REVEL_SESSION cookie are checked
+    locally, then one GET of the settings page (no redirect to /login) confirms it.
+    Only when it has expired, the scripts log in again (and ask for the password).
+  - When the CSRF token is not found in the cookie, it is read from the login form;
+    when the login is rejected (e.g. a stale CSRF token), it is retried once with a new token.
+  - The key is read from the environment variable ATCODER_SESSION_KEY (a Fernet key),
+    or from ~/.atcoder_session_key, which is created on first use (mode 600).
+  - requests and cryptography are imported when they are used, so importing this
+    module (e.g. before the password prompt) is cheap.
+  - Files are as follows:
+    - ./json/session.fernet
+    - ~/.atcoder_session_key
+"""
+import json
+import os
+import re
+import sys
+import time
+import urllib.parse
+from standings_trace import tracer
+from time import sleep
+
+atcoder_url = "https://atcoder.jp"
+atcoder_login_url = f"{atcoder_url}/login"
+atcoder_settings_url = f"{atcoder_url}/settings"    # redirects to /login unless logged in
+session_path = "./json/session.fernet"
+key_path = os.path.expanduser("~/.atcoder_session_key")
+csrf_input = re.compile(r'name="csrf_token" value="([^"]+)"')
+expiry_margin = 600    # seconds; a session expiring sooner is not reused
+
+def revel_session_values(session):
+    #----- REVEL_SESSION: "{signature}-\x00key:value\x00\x00key:value\x00" -> {key: value} -----#
+    revel_session = urllib.parse.unquote(session.cookies.get("REVEL_SESSION", default = ""))
+    values = revel_session.split("-", 1)[-1].strip("\x00").split("\x00\x00")
+    return dict(value.split(":", 1) for value in values if ":" in value)
+
+def retrieve_csrf_token(session, login_page):
+    csrf_token = revel_session_values(session).get("csrf_token")    # randomly generated when accessing the login page (sometimes missing)
+    if not csrf_token:
+        match = csrf_input.search(login_page)    # the same token in the login form
+        csrf_token = match.group(1) if match else None
+    return csrf_token
+
+def is_logged_in(session, username = None):
+    screen_name = revel_session_values(session).get("UserScreenName")
+    return bool(screen_name) and (username is None or screen_name.lower() == username.lower())
+
+def login_to_atcoder(username, password, retries = 3):
+    import requests
+    with tracer.span("login"):
+        session = requests.session()
+        rejected = False
+        for attempt in range(retries + 1):
+            try:
+                response = session.get(atcoder_login_url)    # access with GET method to get cookies
+                response.raise_for_status()
+                csrf_token = retrieve_csrf_token(session, response.text)
+                if csrf_token is None:
+                    print("Could not retrieve csrf_token from the web page.")
+                    sleep(1)
+                    continue
+                with tracer.span("login.wait"):
+                    sleep(1)
+                headers = {"content-type": "application/x-www-form-urlencoded"}
+                login_data = {
+                  "username": username,
+                  "password": password,
+                  "csrf_token": csrf_token,
+                }
+                response = session.post(atcoder_login_url, headers = headers, params = login_data)
+                response.raise_for_status()    # detect 4xx/5xx status code
+            except requests.exceptions.RequestException as e:
+                sys.exit(f"Error: {e}")
+            if is_logged_in(session, username):
+                print("Successfully logged in to Atcoder!")
+                return session
+            if rejected:
+                break    # a wrong password is not posted again (account lockout, rate limit)
+            print("The login was rejected.")    # a stale csrf_token or a wrong password
+            rejected = True
+            session.cookies.clear()
+    sys.exit("Could not log in to AtCoder. Check the username and password, and try again.")
+
+def session_is_valid(session, username):
+    #----- local checks first (no request), then one request without redirect -----#
+    import requests
+    values = revel_session_values(session)
+    if not is_logged_in(session, username):
+        return False
+    if values.get("_TS", "").isdigit() and int(values["_TS"]) < time.time() + expiry_margin:
+        return False
+    try:
+        response = session.get(atcoder_settings_url, allow_redirects = False, timeout = 30)
+    except requests.exceptions.RequestException:
+        return False
+    return response.status_code == 200
+
+def load_key(filepath = key_path):
+    key = os.environ.get("ATCODER_SESSION_KEY")
+    if key:
+        return key.encode()
+    if not os.path.exists(filepath):
+        from cryptography.fernet import Fernet
+        file_descriptor = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(Fernet.generate_key())
+    with open(filepath, "rb") as file:
+        return file.read().strip()
+
+class SessionStore:
+    def __init__(self, filepath = session_path, key = None):
+        try:
+            from cryptography.fernet import Fernet, InvalidToken
+        except ImportError:
+            raise ImportError('"cryptography" is required to save the login session (pip install cryptography).')
+        self.filepath = filepath
+        self.fernet = Fernet(key or load_key())
+        self.invalid_token = InvalidToken
+
+    def load(self, username = None):
+        """Return (username, session) of the saved session (of `username` if given), or None."""
+        if not os.path.exists(self.filepath):
+            return None
+        try:
+            with open(self.filepath, "rb") as file:
+                saved = json.loads(self.fernet.decrypt(file.read()))
+        except (self.invalid_token, ValueError):    # another key or a broken file
+            return None
+        if username is not None and saved["username"].lower() != username.lower():
+            return None
+        import requests
+        session = requests.session()
+        for cookie in saved["cookies"]:
+            session.cookies.set(cookie["name"], cookie["value"], domain = cookie["domain"], path = cookie["path"], expires = cookie["expires"], secure = cookie["secure"])
+        return saved["username"], session
+
+    def save(self, username, session):
+        cookies = [{"name": cookie.name, "value": cookie.value, "domain": cookie.domain, "path": cookie.path, "expires": cookie.expires, "secure": cookie.secure} for cookie in session.cookies]
+        token = self.fernet.encrypt(json.dumps({"username": username, "cookies": cookies, "saved_at": int(time.time())}).encode())
+        os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok = True)
+        file_descriptor = os.open(self.filepath + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(token)
+        os.replace(self.filepath + ".tmp", self.filepath)
+
+    def clear(self):
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+def prompt_password():
+    import pwinput    # only when logging in
+    return pwinput.pwinput(prompt = "  Password: ")
+
+def open_session_store(filepath = session_path):
+    #----- None (log in every time) if cryptography is not installed -----#
+    try:
+        return SessionStore(filepath)
+    except ImportError as e:
+        print(f"  {e} Logging in without saving the session.")
+        return None
+
+def open_session(username, ask_password, store = None, ask_username = None):
+    """Return (username, session): the saved session if it is still valid, otherwise a new login
+    (saved to `store`). `username` None: the user of the saved session, or ask_username().
+    ask_password() is called only when logging in."""
+    if store is not None:
+        saved = store.load(username)
+        if saved is not None:
+            with tracer.span("session.validate"):
+                valid = session_is_valid(saved[1], saved[0])
+            if valid:
+                print(f"Reusing the saved session of {saved[0]}.")
+                return saved
+    if username is None:
+        username = ask_username()
+    session = login_to_atcoder(username, ask_password())
+    if store is not None:
+        store.save(username, session)
+    return username, session
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: bench_import_time.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Startup (import time) budget of the command-line scripts. Each script is
+    imported in a new interpreter with "python -X importtime" (best of --repeat
+    runs), without running it.
+  - The run fails (exit status 1) when
+    - a module which is deferred until it is used (requests, bs4, numpy, pwinput,
+      cryptography) is imported at startup, or
+    - the import time of a script exceeds the budget (benchmarks/import_budget.json)
+      by more than the tolerance.
+    The budget depends on the machine: record it again with --update_budget
+    after a deliberate change or on a new machine.
+  - Usage:
+    $ cd misc/atcoder-standings-table
+    $ python benchmarks/bench_import_time.py                    # compare with the budget
+    $ python benchmarks/bench_import_time.py --update_budget    # record the budget
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.join(benchmarks_dir, "..")
+budget_path = os.path.join(benchmarks_dir, "import_budget.json")
+scripts = ["generate_standings", "generate_best_standings", "generate_batch_standings"]
+deferred_modules = ["requests", "bs4", "numpy", "pwinput", "cryptography"]    # imported only when they are used
+
+def import_time(module):
+    #----- return ({imported module: cumulative microseconds}) of one "import module" in a new interpreter -----#
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd = root_dir, capture_output = True, text = True)
+    if result.returncode != 0:
+        sys.exit(f"Could not import {module}:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():    # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+def measure(module, repeat):
+    #----- return (best milliseconds, imported modules of the last run) -----#
+    best = None
+    for _ in range(repeat):
+        times = import_time(module)
+        best = times[module] if best is None else min(best, times[module])
+    return best / 1000, set(times)
+
+def compare(results, budget, tolerance, slack):
+    regressions = []
+    for script, milliseconds in results.items():
+        budget_milliseconds = budget["scripts"].get(script)
+        if budget_milliseconds is None:
+            continue
+        limit = budget_milliseconds * (1 + tolerance) + slack
+        if milliseconds > limit:
+            regressions.append(f"{script}: {milliseconds:.1f} ms > {limit:.1f} ms (budget {budget_milliseconds:.1f} ms)")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scripts", nargs = "+", choices = scripts, default = scripts)
+    parser.add_argument("--repeat", type = int, default = 7)
+    parser.add_argument("--tolerance", type = float, default = 0.3)    # allowed slowdown (0.3: +30%)
+    parser.add_argument("--slack", type = float, default = 5.0)        # allowed slowdown in milliseconds (timer noise of small imports)
+    parser.add_argument("--budget", default = budget_path)
+    parser.add_argument("--update_budget", action = "store_true")
+    args = parser.parse_args()
+
+    results = {}
+    regressions = []
+    for script in args.scripts:
+        milliseconds, imported = measure(script, args.repeat)
+        results[script] = round(milliseconds, 1)
+        print(f"  {script:<26} {milliseconds:>8.1f} ms")
+        for module in deferred_modules:
+            if module in imported:
+                regressions.append(f"{script}: {module} is imported at startup")
+
+    if regressions:    # not recorded in the budget either
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+
+    if args.update_budget:
+        budget = {"recorded_at": datetime.datetime.now().isoformat(timespec = "seconds"), "python": platform.python_version(), "machine": platform.machine(), "scripts": results}
+        if os.path.exists(args.budget):
+            with open(args.budget) as file:
+                previous = json.load(file)
+            budget["scripts"] = {**previous.get("scripts", {}), **results}    # keep the scripts which were not run
+        with open(args.budget, "w") as file:
+            json.dump(budget, fp = file, indent = 2)
+        print(f"Budget saved: {args.budget}")
+        sys.exit(0)
+
+    if not os.path.exists(args.budget):
+        sys.exit(f"No budget ({args.budget}). Record it with --update_budget.")
+    with open(args.budget) as file:
+        budget = json.load(file)
+    regressions = compare(results, budget, args.tolerance, args.slack)
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print("No regression.")
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: bench_pipeline.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Benchmark and regression suite of the standings pipeline on synthetic contests
+    (synthetic_standings.py), without logging in to AtCoder.
+  - Each stage is measured separately (best time of --repeat runs, and the peak
+    memory of one more run under tracemalloc):
+    - filter_by_affiliation   (generate_best_standings.py, incl. decoding the raw json)
+    - update_best_score       (generate_best_standings.py)
+    - generate_standings_html (generate_best_standings.py)
+    - arrange_standings_html  (generate_standings.py, incl. decoding the raw json)
+  - The results are compared with benchmarks/baseline.json, and the run fails
+    (exit status 1) when a stage is slower or uses more memory than the baseline
+    by more than the tolerance. The baseline depends on the machine: record it
+    again with --update_baseline after a deliberate change or on a new machine.
+  - Usage:
+    $ cd misc/atcoder-standings-table
+    $ python benchmarks/bench_pipeline.py                      # compare with the baseline
+    $ python benchmarks/bench_pipeline.py --update_baseline    # record the baseline
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(benchmarks_dir, ".."))
+from synthetic_standings import generate_contests
+
+baseline_path = os.path.join(benchmarks_dir, "baseline.json")
+scenarios = {    # participants per contest, problems, affiliations, contests
+  "small": {"participants": 2000, "problems": 7, "affiliations": 50, "contests": 5},
+  "medium": {"participants": 20000, "problems": 7, "affiliations": 100, "contests": 10},
+  "large": {"participants": 50000, "problems": 8, "affiliations": 200, "contests": 20},
+}
+contest_info = {"title": "AtCoder Beginner Contest 100", "start_time": "2023/01/01 21:00", "end_time": "2023/01/01 22:40"}
+chunk_size = 64 * 1024
+
+def import_pipeline():
+    import generate_best_standings
+    import generate_standings
+    return generate_best_standings, generate_standings
+
+def measure(function, repeat):
+    #----- return (best seconds, peak bytes); the time is measured without tracemalloc -----#
+    seconds = []
+    for _ in range(repeat):
+        gc.collect()
+        start_time = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start_time)
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(seconds), peak_bytes
+
+def chunks_of(raw):
+    return (raw[position:position + chunk_size] for position in range(0, len(raw), chunk_size))
+
+def run_scenario(scenario, affiliation, repeat, seed):
+    generate_best_standings, generate_standings = import_pipeline()
+    from standings_model import UsernameTable
+    from standings_stream import StandingsStream
+
+    contests = [(contest_id, json.dumps(standings_json, ensure_ascii = False).encode())
+                for contest_id, standings_json in generate_contests(scenario["contests"], scenario["participants"], scenario["problems"], scenario["affiliations"], seed = seed)]
+    contests_id = [contest_id for contest_id, _ in contests]
+    results = {}
+
+    def filter_contests():
+        usernames = UsernameTable()
+        return [generate_best_standings.filter_by_affiliation(contest_id, affiliation, StandingsStream(chunks_of(raw))["StandingsData"], usernames)
+                for contest_id, raw in contests]
+
+    filtered = filter_contests()
+    best = generate_best_standings.update_best_score(len(contests), filtered)
+
+    def arrange_first_contest():
+        contest_id, raw = contests[0]
+        with open(os.path.join("html", f"{contest_id}.html"), "w") as file:
+            generate_standings.arrange_standings_html(contest_id, affiliation, StandingsStream(chunks_of(raw)), contest_info, file)
+
+    stages = {
+      "filter_by_affiliation": filter_contests,
+      "update_best_score": lambda: generate_best_standings.update_best_score(len(contests), filtered),
+      "generate_standings_html": lambda: generate_best_standings.generate_standings_html("Benchmark", contests_id, affiliation, best),
+      "arrange_standings_html": arrange_first_contest,
+    }
+    for stage, function in stages.items():
+        seconds, peak_bytes = measure(function, repeat)
+        results[stage] = {"seconds": round(seconds, 4), "peak_mib": round(peak_bytes / 1024 ** 2, 2)}
+    results["filtered_users"] = len(best["UserInfo"])
+    return results
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    #----- return the regressions as strings -----#
+    regressions = []
+    for scenario, stages in results.items():
+        for stage, result in stages.items():
+            if not isinstance(result, dict):
+                continue
+            base = baseline.get("scenarios", {}).get(scenario, {}).get(stage)
+            if base is None:
+                continue
+            if result["seconds"] > base["seconds"] * (1 + time_tolerance) + 0.005:    # + 5 ms against timer noise
+                regressions.append(f"{scenario}/{stage}: {result['seconds']:.4f} s (baseline {base['seconds']:.4f} s)")
+            if result["peak_mib"] > base["peak_mib"] * (1 + memory_tolerance) + 0.5:   # + 0.5 MiB against allocator noise
+                regressions.append(f"{scenario}/{stage}: {result['peak_mib']:.2f} MiB (baseline {base['peak_mib']:.2f} MiB)")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", nargs = "+", choices = list(scenarios), default = ["small", "medium"])
+    parser.add_argument("--affiliation", default = "Affiliation 001")
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--time_tolerance", type = float, default = 0.3)      # allowed slowdown (0.3: +30%)
+    parser.add_argument("--memory_tolerance", type = float, default = 0.1)    # allowed increase of the peak memory
+    parser.add_argument("--baseline", default = baseline_path)
+    parser.add_argument("--update_baseline", action = "store_true")
+    args = parser.parse_args()
+
+    results = {}
+    working_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)    # the scripts write to ./json and ./html
+        os.makedirs("json")
+        os.makedirs("html")
+        try:
+            for scenario in args.scenarios:
+                print(f"[{scenario}] {scenarios[scenario]}")
+                results[scenario] = run_scenario(scenarios[scenario], args.affiliation, args.repeat, args.seed)
+                for stage, result in results[scenario].items():
+                    if isinstance(result, dict):
+                        print(f"  {stage:<24} {result['seconds']:>9.4f} s {result['peak_mib']:>9.2f} MiB")
+        finally:
+            os.chdir(working_dir)
+
+    if args.update_baseline:
+        baseline = {"recorded_at": datetime.datetime.now().isoformat(timespec = "seconds"), "python": platform.python_version(), "machine": platform.machine(), "scenarios": results}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                previous = json.load(file)
+            baseline["scenarios"] = {**previous.get("scenarios", {}), **results}    # keep the scenarios which were not run
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, fp = file, indent = 2)
+        print(f"Baseline saved: {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        sys.exit(f"No baseline ({args.baseline}). Record it with --update_baseline.")
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print("No regression.")
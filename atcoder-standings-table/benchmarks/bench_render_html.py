@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: bench_render_html.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Benchmark of rendering a large standings table with standings_html.py
+    (precompiled templates, rows written in chunks) against the former
+    "table_html +=" concatenation followed by textwrap.indent.
+  - Usage:
+    $ cd misc/atcoder-standings-table
+    $ python benchmarks/bench_render_html.py --rows 50000
+"""
+import argparse
+import datetime
+import gc
+import os
+import sys
+import tempfile
+import textwrap
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import standings_html
+from standings_model import ContestStandings
+from synthetic_standings import generate_standings_json
+
+def concatenate_rows(standings):
+    #----- the former row rendering of arrange_standings_html -----#
+    table_html = "<tbody>\n"
+    for row in range(len(standings)):
+        contents = [standings.ranks[row], standings.username(row), int(standings.total_scores[row] / 100), str(datetime.timedelta(microseconds = standings.total_elapsed[row] * 1.0e-3))]
+        for task_number in range(standings.tasks_number):
+            task_result = standings.task_result(row, task_number)
+            if task_result != None:
+                contents += [int(task_result[0] * 1.0e-2), str(datetime.timedelta(microseconds = task_result[1] * 1.0e-3))]
+            else:
+                contents += ["-", "-"]
+        table_html += "  <tr>\n"
+        for header_index in range(3 + standings.tasks_number):
+            if header_index <= 1:
+                table_html += f"    <td>{contents[header_index]}</td>\n"
+            else:
+                score, time_text = contents[2 * header_index - 2], contents[2 * header_index - 1]
+                if score == 0 or time_text == "0:00:00" or score == "-" or time_text == "-":
+                    table_html += "    <td>-</td>\n"
+                elif header_index == 2:
+                    table_html += f'    <td><div class="total-score">{score}</div><div class="time">{time_text}</font></td>\n'
+                else:
+                    table_html += f'    <td><div class="score">{score}</div><div class="time">{time_text}</div></td>\n'
+        table_html += "  </tr>\n"
+    table_html += "</tbody>\n"
+    return textwrap.indent(table_html, "      ")
+
+def measure(function):
+    #----- return (seconds, peak bytes); the time is measured without tracemalloc -----#
+    gc.collect()
+    start_time = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start_time
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak_bytes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type = int, default = 50000)
+    parser.add_argument("--problems", type = int, default = 7)
+    args = parser.parse_args()
+
+    contest_id = "abc999"
+    standings_json = generate_standings_json(contest_id, args.rows, args.problems)
+    standings = ContestStandings(contest_id, standings_json["TaskInfo"])
+    standings.extend(standings_json["StandingsData"])
+    del standings_json
+    contest_info = {"title": "AtCoder Beginner Contest 999", "start_time": "2023/01/01 21:00", "end_time": "2023/01/01 22:40"}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        html_filepath = os.path.join(temp_dir, f"{contest_id}.html")
+
+        def render_to_file():
+            with open(html_filepath, "w") as file:
+                standings_html.write_contest_page(file, contest_id, contest_info, "", len(standings), standings)
+
+        def concatenate():
+            with open(html_filepath, "w") as file:
+                file.write(concatenate_rows(standings))
+
+        stream_seconds, stream_peak = measure(render_to_file)
+        file_size = os.path.getsize(html_filepath)
+        concat_seconds, concat_peak = measure(concatenate)
+
+    print(f"rows: {args.rows}, problems: {args.problems}, html: {file_size / 1024 ** 2:.1f} MiB")
+    print(f"{'':>14} {'time [s]':>9} {'peak memory [MiB]':>18}")
+    print(f"{'chunked write':>14} {stream_seconds:>9.3f} {stream_peak / 1024 ** 2:>18.1f}")
+    print(f"{'concatenation':>14} {concat_seconds:>9.3f} {concat_peak / 1024 ** 2:>18.1f}")
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: bench_standings_model.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Memory and speed comparison of the participants held as nested dicts
+    (json.loads) and as the columnar model (ContestStandings in standings_model.py)
+    on a synthetic contest.
+  - Usage:
+    $ cd misc/atcoder-standings-table
+    $ python benchmarks/bench_standings_model.py --participants 20000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from standings_model import ContestStandings
+from standings_stream import StandingsStream
+from synthetic_standings import generate_standings_json
+
+def measure(function):
+    #----- return (result, seconds, retained bytes); the time is measured without tracemalloc -----#
+    gc.collect()
+    start_time = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start_time
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    retained_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, seconds, retained_bytes
+
+def scan_dicts(contest_id, standings_json):
+    #----- read every cell the way arrange_standings_html did (string keys per row) -----#
+    total = 0
+    problems_number = len(standings_json["TaskInfo"])
+    for participant in standings_json["StandingsData"]:
+        total += participant["TotalResult"]["Score"]
+        for problem_number in range(problems_number):
+            task_result = participant["TaskResults"].get(contest_id + "_" + chr(problem_number + 97))
+            if task_result != None:
+                total += task_result["Score"] + task_result["Elapsed"]
+    return total
+
+def scan_model(standings):
+    total = 0
+    for row in range(len(standings)):
+        total += standings.total_scores[row]
+        for task_number in range(standings.tasks_number):
+            task_result = standings.task_result(row, task_number)
+            if task_result != None:
+                total += task_result[0] + task_result[1]
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--participants", type = int, default = 20000)
+    parser.add_argument("--problems", type = int, default = 7)
+    args = parser.parse_args()
+
+    contest_id = "abc999"
+    raw_body = json.dumps(generate_standings_json(contest_id, args.participants, args.problems), ensure_ascii = False).encode()
+
+    def load_model():
+        stream = StandingsStream(raw_body[position:position + 64 * 1024] for position in range(0, len(raw_body), 64 * 1024))
+        participants = stream["StandingsData"]
+        first = next(participants)    # "TaskInfo" comes before "StandingsData"
+        standings = ContestStandings(contest_id, stream.header["TaskInfo"])
+        standings.append(first)
+        standings.extend(participants)
+        return standings
+
+    standings_json, dict_load_seconds, dict_bytes = measure(lambda: json.loads(raw_body))
+    standings, model_load_seconds, model_bytes = measure(load_model)
+    dict_total, dict_scan_seconds, _ = measure(lambda: scan_dicts(contest_id, standings_json))
+    model_total, model_scan_seconds, _ = measure(lambda: scan_model(standings))
+    assert dict_total == model_total
+
+    print(f"participants: {args.participants}, problems: {args.problems}, body: {len(raw_body) / 1024 ** 2:.1f} MiB")
+    print(f"{'':>8} {'load [s]':>10} {'scan [s]':>10} {'memory [MiB]':>13}")
+    print(f"{'dict':>8} {dict_load_seconds:>10.3f} {dict_scan_seconds:>10.3f} {dict_bytes / 1024 ** 2:>13.1f}")
+    print(f"{'model':>8} {model_load_seconds:>10.3f} {model_scan_seconds:>10.3f} {model_bytes / 1024 ** 2:>13.1f}")
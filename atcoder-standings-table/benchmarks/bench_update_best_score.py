@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: bench_update_best_score.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Micro-benchmark of merging the filtered results of many contests
+    (BestScoreAggregator in standings_aggregate.py).
+  - For small sizes, the former linear username scan is also measured for comparison.
+  - Usage:
+    $ cd misc/atcoder-standings-table
+    $ python benchmarks/bench_update_best_score.py --users 1000 10000 100000 --contests 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from standings_aggregate import BestScoreAggregator
+
+def generate_filtered_contests(users_number, contests_number, participation = 0.6, seed = 0):
+    #----- each contest has about `participation` of all users, scores are multiples of 100 -----#
+    random_generator = random.Random(seed)
+    usernames = [f"user{user_index:06d}" for user_index in range(users_number)]
+    standings_data = []
+    for contest_index in range(contests_number):
+        contest_id = f"abc{100 + contest_index}"
+        participants = random_generator.sample(usernames, int(users_number * participation))
+        userinfo = [{"UserName": username, "TotalScore": 100 * random_generator.randint(0, 21), "ContestId": contest_id} for username in participants]
+        standings_data.append({"UserInfo": userinfo})
+    return standings_data
+
+def merge_by_linear_scan(standings_data):
+    #----- the former algorithm of update_best_score (O(n*m) username scan) -----#
+    reference_userinfo = [dict(user) for user in standings_data[0]["UserInfo"]]
+    for contest in standings_data[1:]:
+        for user in contest["UserInfo"]:
+            for item in reference_userinfo:
+                if item["UserName"] == user["UserName"]:
+                    if user["TotalScore"] > item["TotalScore"]:
+                        item["TotalScore"] = user["TotalScore"]
+                        item["ContestId"] = user["ContestId"]
+                    break
+            else:
+                reference_userinfo.append(dict(user))
+    return reference_userinfo
+
+def merge_by_index(standings_data):
+    aggregator = BestScoreAggregator()
+    for contest in standings_data:
+        aggregator.add_contest(contest["UserInfo"])
+    return aggregator.ranking()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type = int, nargs = "+", default = [1000, 10000, 100000])
+    parser.add_argument("--contests", type = int, default = 50)
+    parser.add_argument("--linear_scan_max_users", type = int, default = 1000)    # the linear scan is too slow beyond this
+    args = parser.parse_args()
+
+    print(f"{'users':>8} {'contests':>8} {'indexed merge [s]':>18} {'linear scan [s]':>16}")
+    for users_number in args.users:
+        standings_data = generate_filtered_contests(users_number, args.contests)
+        start_time = time.perf_counter()
+        merge_by_index(standings_data)
+        indexed_seconds = time.perf_counter() - start_time
+
+        linear_label = "-"
+        if users_number <= args.linear_scan_max_users:
+            start_time = time.perf_counter()
+            merge_by_linear_scan(standings_data)
+            linear_label = f"{time.perf_counter() - start_time:.3f}"
+        print(f"{users_number:>8} {args.contests:>8} {indexed_seconds:>18.3f} {linear_label:>16}")
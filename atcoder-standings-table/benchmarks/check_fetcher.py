@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: check_fetcher.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Offline check of the fetch engine (standings_fetcher.py) against a local
+    stand-in of atcoder.jp (http.server) serving recorded standings json
+    (the .json files of a directory, named {contest_id}.json) or synthetic ones
+    (synthetic_standings.py). No login is needed.
+  - The following are checked, and the run fails (exit status 1) otherwise:
+    - StandingsFetcher.fetch_all() returns the bodies in the order of the URLs,
+      even when the first contest is answered last
+    - a 503 with Retry-After is retried, a 404 is not
+    - the cookies of the given session are sent with every request
+    - generate_best_standings.py --base_url fetches and ranks the same contests
+  - Usage:
+    $ cd misc/atcoder-standings-table
+    $ python benchmarks/check_fetcher.py                    # synthetic contests
+    $ python benchmarks/check_fetcher.py ./json/recorded    # recorded {contest_id}.json
+"""
+import argparse
+import http.server
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.join(benchmarks_dir, "..")
+sys.path.insert(0, root_dir)
+from standings_fetcher import StandingsFetcher
+from synthetic_standings import generate_contests
+
+session_cookie = ("REVEL_SESSION", "check-fetcher")
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    def __init__(self, address, bodies, slow_contest_id = None, unavailable_contest_id = None):
+        super().__init__(address, StandInHandler)
+        self.bodies = bodies                                    # contest ID -> standings json (bytes)
+        self.slow_contest_id = slow_contest_id                  # answered after the others
+        self.unavailable_contest_id = unavailable_contest_id    # 503 (Retry-After: 0) on the first request
+        self.requests = []                                      # (path, Cookie header)
+        self.lock = threading.Lock()
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append((self.path, self.headers.get("Cookie", "")))
+            attempts = sum(path == self.path for path, _ in self.server.requests)
+        parts = self.path.strip("/").split("/")    # contests/{contest_id}/standings/json
+        contest_id = parts[1] if len(parts) == 4 and parts[0] == "contests" and parts[2:] == ["standings", "json"] else None
+        if contest_id not in self.server.bodies:
+            self.send_error(404)
+            return
+        if contest_id == self.server.unavailable_contest_id and attempts == 1:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if contest_id == self.server.slow_contest_id:
+            time.sleep(0.5)
+        body = self.server.bodies[contest_id]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def load_bodies(directory):
+    bodies = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json") and "_" not in filename:    # not {contest_id}_filtered.json
+            with open(os.path.join(directory, filename), "rb") as file:
+                bodies[filename[:-len(".json")]] = file.read()
+    return bodies
+
+def check_fetch_all(base_url, server, contests_id):
+    import requests
+    failures = []
+    session = requests.session()
+    session.cookies.set(*session_cookie)
+    urls = [f"{base_url}/contests/{contest_id}/standings/json" for contest_id in contests_id]
+    with StandingsFetcher(session, workers = len(urls), rate_limit = 0, retries = 2, backoff = 0) as fetcher:
+        try:
+            bodies = fetcher.fetch_all(urls, lambda url: fetcher.get(url).content)
+            if bodies != [server.bodies[contest_id] for contest_id in contests_id]:
+                failures.append("fetch_all() did not return the bodies in the order of the URLs")
+        except requests.exceptions.RequestException as e:
+            failures.append(f"fetch_all() failed: {e}")
+        try:
+            fetcher.get(f"{base_url}/contests/missing/standings/json")
+            failures.append("a 404 did not raise an error")
+        except requests.exceptions.HTTPError:
+            pass
+
+    def attempts(path):
+        return sum(requested_path == path for requested_path, _ in server.requests)
+    if attempts(f"/contests/{server.unavailable_contest_id}/standings/json") != 2:
+        failures.append("a 503 with Retry-After was not retried exactly once")
+    if attempts("/contests/missing/standings/json") != 1:
+        failures.append("a 404 was retried")
+    cookie = "=".join(session_cookie)
+    if not all(cookie in cookie_header for _, cookie_header in server.requests):
+        failures.append("the cookies of the session were not sent with every request")
+    return failures
+
+def check_best_standings(base_url, server, contests_id, affiliation):
+    #----- generate_best_standings.py in a temporary directory (it writes to ./json and ./html) -----#
+    script = os.path.abspath(os.path.join(root_dir, "generate_best_standings.py"))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, "json"))
+        os.makedirs(os.path.join(temp_dir, "html"))
+        result = subprocess.run([sys.executable, script, "--base_url", base_url, "-a", affiliation, "-c", *contests_id, "--rate_limit", "0"],
+                                cwd = temp_dir, capture_output = True, text = True)
+        if result.returncode != 0:
+            return [f"generate_best_standings.py --base_url failed:\n{result.stdout}{result.stderr}"]
+        with open(os.path.join(temp_dir, "json", "best_standings.json")) as file:
+            ranked = {user["UserName"] for user in json.load(file)["UserInfo"]}
+    expected = {participant["UserName"] for contest_id in contests_id
+                for participant in json.loads(server.bodies[contest_id])["StandingsData"] if participant["Affiliation"] == affiliation}
+    return [] if ranked == expected else ["generate_best_standings.py --base_url did not rank the participants of the affiliation"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", nargs = "?")                            # directory of the recorded standings ({contest_id}.json)
+    parser.add_argument("--contests", type = int, default = 4)               # (synthetic) number of contests
+    parser.add_argument("--participants", type = int, default = 500)         # (synthetic) participants per contest
+    parser.add_argument("--affiliation")                                     # default: the affiliation of the first participant
+    args = parser.parse_args()
+
+    if args.directory is not None:
+        bodies = load_bodies(args.directory)
+    else:
+        bodies = {contest_id: json.dumps(standings_json, ensure_ascii = False).encode() for contest_id, standings_json in generate_contests(args.contests, args.participants)}
+    if len(bodies) < 2:
+        sys.exit("Error: at least two contests are needed.")
+    contests_id = list(bodies)
+    affiliation = args.affiliation or json.loads(bodies[contests_id[0]])["StandingsData"][0]["Affiliation"]
+
+    server = StandInServer(("127.0.0.1", 0), bodies, slow_contest_id = contests_id[0], unavailable_contest_id = contests_id[1])
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"[Stand-in] {len(contests_id)} contest(s) at {base_url}")
+    try:
+        failures = check_fetch_all(base_url, server, contests_id)
+        server.unavailable_contest_id = None
+        failures += check_best_standings(base_url, server, contests_id, affiliation)
+    finally:
+        server.shutdown()
+
+    if failures:
+        print("Failures:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("All checks passed.")
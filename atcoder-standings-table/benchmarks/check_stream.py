@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: check_stream.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Offline check of the incremental parser (standings_stream.py) against json.loads
+    on synthetic standings json (synthetic_standings.py) or recorded ones.
+  - Each body is fed in chunks of 1 byte, 7 KiB and 64 KiB (a chunk may end in the
+    middle of a token or of a multi-byte character), in several layouts:
+    - "TaskInfo" before "StandingsData" (as AtCoder returns it)
+    - "StandingsData" before "TaskInfo"
+    - pretty-printed (indent = 2), escaped non-ASCII characters (ensure_ascii = True)
+    - an empty "StandingsData"
+  - The following are checked, and the run fails (exit status 1) otherwise:
+    - the participants and the other keys are the same as json.loads
+    - the raw body written to `raw_file` is the same as the input
+    - reading "StandingsData" after another key (i.e. after it was skipped) raises an error
+  - Usage:
+    $ cd misc/atcoder-standings-table
+    $ python benchmarks/check_stream.py                       # synthetic standings
+    $ python benchmarks/check_stream.py ./json/abc123.json    # recorded standings
+"""
+import argparse
+import io
+import json
+import os
+import sys
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(benchmarks_dir, ".."))
+from standings_stream import StandingsStream
+from synthetic_standings import generate_standings_json
+
+chunk_sizes = [1, 7 * 1024, 64 * 1024]
+tricky_affiliations = ["東京大学", "Ｘ株式会社 \"A\", [B]: {C}", "école\\", ""]    # multi-byte characters, escapes, json punctuation
+
+def chunked(body, chunk_size):
+    return (body[start:start + chunk_size] for start in range(0, len(body), chunk_size))
+
+def synthetic_standings(participants_number):
+    standings_json = generate_standings_json("abc999", participants_number)
+    for participant_number, participant in enumerate(standings_json["StandingsData"]):
+        participant["Affiliation"] = tricky_affiliations[participant_number % len(tricky_affiliations)]
+    return standings_json
+
+def layouts(standings_json):
+    #----- return [(name, body)] of the same standings in several layouts -----#
+    participants_first = {"StandingsData": standings_json["StandingsData"], **{key: value for key, value in standings_json.items() if key != "StandingsData"}}
+    empty = {**standings_json, "StandingsData": []}
+    return [
+      ("TaskInfo first", json.dumps(standings_json, ensure_ascii = False, separators = (",", ":")).encode()),
+      ("StandingsData first", json.dumps(participants_first, ensure_ascii = False).encode()),
+      ("pretty-printed, ASCII", json.dumps(standings_json, ensure_ascii = True, indent = 2).encode() + b"\n"),
+      ("empty StandingsData", json.dumps(empty, ensure_ascii = False).encode()),
+    ]
+
+def check_body(name, body, chunk_size):
+    failures = []
+    expected = json.loads(body)
+    raw_file = io.BytesIO()
+    stream = StandingsStream(chunked(body, chunk_size), raw_file = raw_file)
+    try:
+        participants = list(stream["StandingsData"])
+        header = {key: stream[key] for key in expected if key != "StandingsData"}
+    except ValueError as e:
+        return [f"{name}, {chunk_size} B chunks: {e}"]
+    if participants != expected["StandingsData"]:
+        failures.append(f"{name}, {chunk_size} B chunks: the participants differ from json.loads ({len(participants)} / {len(expected['StandingsData'])})")
+    if header != {key: value for key, value in expected.items() if key != "StandingsData"}:
+        failures.append(f"{name}, {chunk_size} B chunks: the other keys differ from json.loads")
+    if raw_file.getvalue() != body:
+        failures.append(f"{name}, {chunk_size} B chunks: the raw body differs from the input")
+    return failures
+
+def check_order(name, body):
+    #----- "StandingsData" cannot be read once it has been skipped -----#
+    stream = StandingsStream(chunked(body, 7 * 1024))
+    stream["TaskInfo"]
+    try:
+        participants = list(stream["StandingsData"])
+    except RuntimeError:
+        return []
+    return [f"{name}: reading StandingsData after TaskInfo did not raise an error ({len(participants)} participants)"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs = "*")                                 # recorded standings json (default: synthetic)
+    parser.add_argument("--participants", type = int, default = 100)         # (synthetic) participants
+    args = parser.parse_args()
+
+    if args.files:
+        bodies = []
+        for filepath in args.files:
+            with open(filepath, "rb") as file:
+                body = file.read()
+            bodies.append((os.path.basename(filepath), body))
+            bodies += [(f"{os.path.basename(filepath)} ({name})", layout_body) for name, layout_body in layouts(json.loads(body))]
+    else:
+        bodies = layouts(synthetic_standings(args.participants))
+
+    failures = []
+    for name, body in bodies:
+        for chunk_size in chunk_sizes:
+            failures += check_body(name, body, chunk_size)
+        failures += check_order(name, body)
+        print(f"  {name:<32} {len(body):>10,} B")
+
+    if failures:
+        print("Failures:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("All checks passed.")
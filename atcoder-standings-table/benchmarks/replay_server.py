@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: replay_server.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Local mock of atcoder.jp for the watch mode of generate_standings.py.
+    Each request of /contests/{contest_id}/standings/json returns the next
+    snapshot of a sequence (the last one is repeated), with an ETag, and
+    answers 304 Not Modified to a conditional request for the same body.
+  - The snapshots are the .json files of a directory (in the order of the file
+    names, e.g. recorded with `generate_standings.py --watch ... --record DIR`),
+    or synthetic ones (synthetic_standings.py) with --synthetic.
+  - /contests/{contest_id}/ returns a minimal contest page (title and times).
+  - Usage:
+    $ cd misc/atcoder-standings-table
+    $ python benchmarks/replay_server.py --synthetic 20000 --snapshots 10 --contest_id abc999
+    $ python generate_standings.py --base_url http://127.0.0.1:8000 --watch 1 --watch_log watch.jsonl
+"""
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_standings import generate_snapshots, generate_standings_json
+
+contest_page_format = (
+    '<html><head><title>{contest_id} (replay)</title></head><body>'
+    '<time class="fixtime fixtime-full">2023-01-01 21:00:00+0900</time> - '
+    '<time class="fixtime fixtime-full">2023-01-01 22:40:00+0900</time>'
+    '</body></html>'
+)
+
+class ReplayServer(http.server.ThreadingHTTPServer):
+    def __init__(self, address, contest_id, snapshots, repeat = 1):
+        super().__init__(address, ReplayHandler)
+        self.contest_id = contest_id
+        self.snapshots = snapshots    # bodies (bytes)
+        self.repeat = max(1, repeat)  # requests per snapshot
+        self.requests_number = 0
+        self.lock = threading.Lock()
+
+    def next_snapshot(self):
+        with self.lock:
+            snapshot_number = min(self.requests_number // self.repeat, len(self.snapshots) - 1)
+            self.requests_number += 1
+        return self.snapshots[snapshot_number]
+
+class ReplayHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        contest_path = f"/contests/{self.server.contest_id}/"
+        if self.path == contest_path + "standings/json":
+            body = self.server.next_snapshot()
+            content_type = "application/json"
+        elif self.path == contest_path:
+            body = contest_page_format.format(contest_id = self.server.contest_id).encode()
+            content_type = "text/html; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def load_snapshots(directory):
+    filenames = sorted(filename for filename in os.listdir(directory) if filename.endswith(".json"))
+    snapshots = []
+    for filename in filenames:
+        with open(os.path.join(directory, filename), "rb") as file:
+            snapshots.append(file.read())
+    return snapshots
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", nargs = "?")                            # directory of the recorded snapshots (.json)
+    parser.add_argument("--contest_id", default = "abc999")
+    parser.add_argument("--synthetic", type = int, metavar = "PARTICIPANTS")  # generate the snapshots instead of reading them
+    parser.add_argument("--snapshots", type = int, default = 10)             # (synthetic) number of snapshots
+    parser.add_argument("--repeat", type = int, default = 1)                 # number of requests answered with each snapshot
+    parser.add_argument("--port", type = int, default = 8000)
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        standings_json = generate_standings_json(args.contest_id, args.synthetic)
+        snapshots = [json.dumps(snapshot, ensure_ascii = False, separators = (",", ":")).encode() for snapshot in generate_snapshots(standings_json, args.snapshots)]
+    elif args.directory is not None:
+        snapshots = load_snapshots(args.directory)
+    else:
+        sys.exit("Error: give a directory of snapshots or --synthetic.")
+    if not snapshots:
+        sys.exit("Error: no snapshots.")
+
+    server = ReplayServer(("127.0.0.1", args.port), args.contest_id, snapshots, args.repeat)
+    print(f"Replaying {len(snapshots)} snapshot(s) of {args.contest_id} at http://127.0.0.1:{args.port}/contests/{args.contest_id}/standings/json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
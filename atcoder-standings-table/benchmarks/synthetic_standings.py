@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: synthetic_standings.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Seeded generator of standings data in the same shape as
+    https://atcoder.jp/contests/{contest_id}/standings/json
+    ("TaskInfo" and "StandingsData" with "TaskResults" and "TotalResult"),
+    used by the benchmarks so that they run without logging in to AtCoder.
+"""
+import random
+
+def affiliation_names(affiliations_number):
+    return [""] + [f"Affiliation {affiliation_number:03d}" for affiliation_number in range(affiliations_number)]
+
+def generate_task_info(contest_id, problems_number):
+    return [{"Assignment": chr(task_number + 65), "TaskName": f"Problem {chr(task_number + 65)}", "TaskScreenName": f"{contest_id}_{chr(task_number + 97)}"} for task_number in range(problems_number)]
+
+def generate_standings_json(contest_id, participants_number, problems_number = 7, affiliations_number = 50, solve_rate = 0.5, seed = 0):
+    """Return a dict like the standings json. Harder problems are solved less often,
+    and the participants are sorted by (TotalScore desc, Elapsed asc)."""
+    random_generator = random.Random(seed)
+    task_info = generate_task_info(contest_id, problems_number)
+    affiliations = affiliation_names(affiliations_number)
+    contest_seconds = 100 * 60
+
+    participants = []
+    for participant_number in range(participants_number):
+        task_results = {}
+        total_score, total_elapsed, penalty = 0, 0, 0
+        for task_number, task in enumerate(task_info):
+            if random_generator.random() > solve_rate ** (task_number * 0.5) * 1.2:
+                continue    # not submitted
+            failure = random_generator.randint(0, 2) if random_generator.random() < 0.3 else 0
+            accepted = random_generator.random() < 0.85
+            score = 100 * (task_number + 1) * 100 if accepted else 0
+            elapsed = random_generator.randint(60, contest_seconds) * 10 ** 9 if accepted else 0
+            task_results[task["TaskScreenName"]] = {"Count": failure + 1, "Failure": failure, "Penalty": failure if accepted else 0, "Score": score, "Elapsed": elapsed, "Status": 1 if accepted else 6, "Pending": False, "Frozen": False, "Additional": None}
+            total_score += score
+            total_elapsed = max(total_elapsed, elapsed)
+            penalty += failure if accepted else 0
+        participants.append({
+          "Rank": 0,
+          "Additional": None,
+          "UserName": f"user_{seed}_{participant_number:06d}",
+          "UserScreenName": f"user_{seed}_{participant_number:06d}",
+          "UserIsDeleted": False,
+          "Affiliation": affiliations[int(random_generator.paretovariate(1.2)) % len(affiliations)],
+          "Country": "JP",
+          "Rating": random_generator.randint(0, 3000),
+          "OldRating": 0,
+          "IsRated": True,
+          "IsTeam": False,
+          "Competitions": random_generator.randint(1, 100),
+          "AtCoderRank": 0,
+          "TaskResults": task_results,
+          "TotalResult": {"Count": len(task_results), "Accepted": sum(1 for result in task_results.values() if result["Score"] > 0), "Penalty": penalty, "Score": total_score, "Elapsed": total_elapsed, "Frozen": False, "Additional": None},
+        })
+
+    participants.sort(key = lambda participant: (-participant["TotalResult"]["Score"], participant["TotalResult"]["Elapsed"]))
+    for participant_number, participant in enumerate(participants):
+        participant["Rank"] = participant_number + 1
+    return {"Fixed": True, "AdditionalColumns": None, "TaskInfo": task_info, "StandingsData": participants}
+
+def generate_contests(contests_number, participants_number, problems_number = 7, affiliations_number = 50, users_number = None, seed = 0):
+    """Return [(contest_id, standings json)] of consecutive contests whose participants are drawn
+    from one pool of users (1.5 times the participants by default), each with a fixed affiliation,
+    so that the same users appear in several contests."""
+    random_generator = random.Random(seed)
+    users_number = users_number or participants_number * 3 // 2
+    affiliations = affiliation_names(affiliations_number)
+    users = [(f"user{user_number:07d}", affiliations[int(random_generator.paretovariate(1.2)) % len(affiliations)]) for user_number in range(users_number)]
+    contests = []
+    for contest_number in range(contests_number):
+        contest_id = f"abc{100 + contest_number}"
+        standings_json = generate_standings_json(contest_id, participants_number, problems_number, affiliations_number, seed = seed + contest_number + 1)
+        for participant, (username, affiliation) in zip(standings_json["StandingsData"], random_generator.sample(users, participants_number)):
+            participant["UserName"] = participant["UserScreenName"] = username
+            participant["Affiliation"] = affiliation
+        contests.append((contest_id, standings_json))
+    return contests
+
+def generate_snapshots(standings_json, snapshots_number, contest_seconds = 100 * 60):
+    """Return the standings json at `snapshots_number` evenly spaced times of the contest
+    (only the results accepted by then, ranks recomputed). Only the last one is "Fixed"."""
+    snapshots = []
+    for snapshot_number in range(1, snapshots_number + 1):
+        elapsed_limit = contest_seconds * 10 ** 9 * snapshot_number // snapshots_number
+        participants = []
+        for participant in standings_json["StandingsData"]:
+            task_results = {task_name: task_result for task_name, task_result in participant["TaskResults"].items()
+                            if 0 < task_result["Elapsed"] <= elapsed_limit or snapshot_number == snapshots_number}
+            accepted = [task_result for task_result in task_results.values() if task_result["Score"] > 0]
+            total_result = dict(participant["TotalResult"], Count = len(task_results), Accepted = len(accepted),
+                                Penalty = sum(task_result["Penalty"] for task_result in accepted),
+                                Score = sum(task_result["Score"] for task_result in accepted),
+                                Elapsed = max((task_result["Elapsed"] for task_result in accepted), default = 0))
+            participants.append(dict(participant, TaskResults = task_results, TotalResult = total_result))
+        participants.sort(key = lambda participant: (-participant["TotalResult"]["Score"], participant["TotalResult"]["Elapsed"]))
+        for participant_number, participant in enumerate(participants):
+            participant["Rank"] = participant_number + 1
+        snapshots.append(dict(standings_json, Fixed = snapshot_number == snapshots_number, StandingsData = participants))
+    return snapshots
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: filtered_output.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Writer of the filtered standings ({contest_id}_filtered.*) shared by
+    generate_standings.py, generate_best_standings.py and generate_batch_standings.py.
+    The records are written one by one to a single buffered file.
+  - Formats:
+    - json   : {"UserInfo": [record, ...]} (indent = 2, or one line with compact = True)
+    - jsonl  : one compact record per line (JSON Lines)
+    - msgpack: a sequence of MessagePack maps, one per record (requires msgpack)
+"""
+import json
+
+filtered_formats = ("json", "jsonl", "msgpack")
+extensions = {"json": "json", "jsonl": "jsonl", "msgpack": "msgpack"}
+
+def filtered_filepath(directory, contest_id, filtered_format = "json"):
+    return f"{directory}/{contest_id}_filtered.{extensions[filtered_format]}"
+
+class FilteredWriter:
+    def __init__(self, filepath, filtered_format = "json", compact = False):
+        if filtered_format not in filtered_formats:
+            raise ValueError(f"Unknown format of the filtered standings: {filtered_format}")
+        self.filtered_format = filtered_format
+        self.compact = compact
+        self.records_number = 0
+        if filtered_format == "msgpack":
+            try:
+                import msgpack
+            except ImportError:
+                raise ImportError('"msgpack" is required for --filtered_format msgpack (pip install msgpack).')
+            self.packer = msgpack.Packer()
+            self.file = open(filepath, "wb")
+        else:
+            self.file = open(filepath, "w", encoding = "utf-8")
+            if filtered_format == "json":
+                self.file.write('{"UserInfo":[' if compact else '{\n  "UserInfo": [')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, record):
+        if self.filtered_format == "msgpack":
+            self.file.write(self.packer.pack(record))
+        elif self.filtered_format == "jsonl":
+            self.file.write(json.dumps(record, ensure_ascii = False, separators = (",", ":")) + "\n")
+        elif self.compact:
+            self.file.write(("," if self.records_number else "") + json.dumps(record, ensure_ascii = False, separators = (",", ":")))
+        else:    # the same text as json.dump({"UserInfo": records}, indent = 2)
+            self.file.write(("," if self.records_number else "") + "\n    " + json.dumps(record, ensure_ascii = False, indent = 2).replace("\n", "\n    "))
+        self.records_number += 1
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.filtered_format == "json":
+            if self.compact:
+                self.file.write("]}")
+            else:
+                self.file.write("\n  ]\n}" if self.records_number else "]\n}")
+        self.file.close()
+
+def save_filtered(filepath, records, filtered_format = "json", compact = False):
+    with FilteredWriter(filepath, filtered_format, compact) as writer:
+        writer.write_all(records)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+- Script: generate_batch_standings.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Batch (non-interactive) version of generate_standings.py.
+    For every pair of the contests and the affiliations listed in a manifest,
+    generate the standings of the affiliation (.json and .html).
+  - It logs in to AtCoder once, fetches each contest once, and splits the
+    participants by affiliation in a single pass over "StandingsData".
+    The pages are rendered by a process pool.
+  - The login information is read from the environment variables
+    ATCODER_USERNAME and ATCODER_PASSWORD (not needed with --offline, or while
+    the session saved by atcoder_session.py is valid).
+  - Manifest (.json):
+      {
+        "contests": ["abc123", "abc124"],
+        "affiliations": {"xxx_univ": "XXX大学", "yyy_univ": "YYY大学"}
+      }
+    ("affiliations" maps a label, used as the name of the output directory, to the affiliation)
+  - Output files are as follows:
+    - ./json/{contest_id}.json
+    - ./json/{label}/{contest_id}_filtered.json (or .jsonl/.msgpack, see filtered_output.py)
+    - ./html/{label}/{contest_id}.html
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from atcoder_session import open_session, open_session_store
+from filtered_output import filtered_filepath, filtered_formats
+from generate_standings import retrieve_contest_info, save_filtered_standings, write_standings_html
+from standings_cache import CacheMissError, StandingsCache, standings_is_fixed
+from standings_fetcher import StandingsFetcher, request_errors, standings_url_format
+from standings_stream import StandingsStream
+
+json_dir = "./json"
+html_dir = "./html"
+css_path = "../../standings.css"    # from ./html/{label}/
+
+def load_manifest(manifest_path):
+    with open(manifest_path) as file:
+        manifest = json.load(file)
+    contests_id = list(manifest["contests"])
+    affiliations = dict(manifest["affiliations"])    # label -> affiliation
+    if len(set(affiliations.values())) != len(affiliations):
+        sys.exit("Error: the same affiliation appears twice in the manifest.")
+    return contests_id, affiliations
+
+def partition_by_affiliation(standings_all_json, affiliations):
+    #----- one pass over "StandingsData": affiliation -> participants -----------------#
+    partitions = {affiliation: [] for affiliation in affiliations}
+    participants_number = 0
+    for participant in standings_all_json["StandingsData"]:
+        participants_number += 1
+        partition = partitions.get(participant["Affiliation"])
+        if partition is not None:
+            partition.append(participant)
+    return partitions, participants_number
+
+def render_pair(contest_id, label, affiliation, problems_data, standings_data, participants_number, contest_info, filtered_format = "json", compact = False):
+    #----- runs in a worker process -----#
+    save_filtered_standings(filtered_filepath(f"{json_dir}/{label}", contest_id, filtered_format), standings_data, filtered_format, compact)
+    html_filepath = f"{html_dir}/{label}/{contest_id}.html"
+    with open(html_filepath, "w") as file:
+        write_standings_html(file, contest_id, affiliation, problems_data, standings_data, participants_number, contest_info, css_path)
+    return html_filepath
+
+if __name__ == "__main__":
+    #----- take arguments from the command line ------------------------------#
+    parser = argparse.ArgumentParser()
+    parser.add_argument("manifest")                                          # path of the manifest (.json)
+    parser.add_argument("-w", "--workers", type = int, default = 4)          # number of concurrent downloads
+    parser.add_argument("-p", "--processes", type = int, default = os.cpu_count())    # number of rendering processes
+    parser.add_argument("--rate_limit", type = float, default = 2.0)        # max requests per second to atcoder.jp (0: no limit)
+    parser.add_argument("--retries", type = int, default = 3)               # retries for connection errors, 429 and 5xx
+    parser.add_argument("--offline", action = "store_true")                  # read only from the cache (./json/cache), no login
+    parser.add_argument("--cache_size", type = int, default = 1024)          # max size of the cache in MiB
+    parser.add_argument("--filtered_format", choices = filtered_formats, default = "json")    # format of {contest_id}_filtered.*
+    parser.add_argument("--compact", action = "store_true")                  # write the filtered json without indentation
+    parser.add_argument("--no_session", action = "store_true")               # log in every time (do not reuse or save the session, see atcoder_session.py)
+    args = parser.parse_args()
+
+    contests_id, affiliations = load_manifest(args.manifest)
+    affiliation_labels = {affiliation: label for label, affiliation in affiliations.items()}
+    for label in affiliations:
+        os.makedirs(f"{json_dir}/{label}", exist_ok = True)
+        os.makedirs(f"{html_dir}/{label}", exist_ok = True)
+    print(f"[Batch] {len(contests_id)} contest(s) x {len(affiliations)} affiliation(s)")
+
+    #----- log in to AtCoder once ----------------------------------------------#
+    session = None
+    if not args.offline:
+        def environment_password():
+            login_password = os.environ.get("ATCODER_PASSWORD")
+            if not login_password:
+                sys.exit("Error: set ATCODER_USERNAME and ATCODER_PASSWORD (or use --offline).")
+            return login_password
+
+        def environment_username():
+            login_username = os.environ.get("ATCODER_USERNAME")
+            if not login_username:
+                sys.exit("Error: set ATCODER_USERNAME and ATCODER_PASSWORD (or use --offline).")
+            return login_username
+
+        session_store = None if args.no_session else open_session_store()
+        _, session = open_session(os.environ.get("ATCODER_USERNAME") or None, environment_password, session_store, ask_username = environment_username)
+
+    cache = StandingsCache(max_bytes = args.cache_size * 1024 * 1024, offline = args.offline)
+    fetcher = None if args.offline else StandingsFetcher(session, workers = args.workers, rate_limit = args.rate_limit, retries = args.retries)
+    print("--------------------------------------------------")
+    with ProcessPoolExecutor(max_workers = args.processes) as renderer:
+
+        def fetch_and_partition(contest_id):
+            #----- fetch one contest, split it by affiliation and queue the rendering -----#
+            standings_url = standings_url_format.format(contest_id = contest_id)
+            print(f'Retrieving standings data from "{standings_url}"...')
+            contest_info = retrieve_contest_info(contest_id, cache, fetcher)
+            json_filepath = f"{json_dir}/{contest_id}.json"
+            try:
+                with open(f"{json_filepath}.tmp", "wb") as json_file:    # the previous file is kept if the download fails
+                    standings_chunks = cache.fetch_chunks(contest_id, standings_url, fetcher, is_final = standings_is_fixed)
+                    standings_all_json = StandingsStream(standings_chunks, raw_file = json_file)
+                    partitions, participants_number = partition_by_affiliation(standings_all_json, affiliation_labels)
+                    problems_data = standings_all_json["TaskInfo"]
+                os.replace(f"{json_filepath}.tmp", json_filepath)
+            finally:
+                if os.path.exists(f"{json_filepath}.tmp"):
+                    os.remove(f"{json_filepath}.tmp")
+            return [renderer.submit(render_pair, contest_id, affiliation_labels[affiliation], affiliation, problems_data, standings_data, participants_number, contest_info, args.filtered_format, args.compact)
+                    for affiliation, standings_data in partitions.items()]
+
+        try:
+            if fetcher is None:
+                render_futures = [fetch_and_partition(contest_id) for contest_id in contests_id]
+            else:
+                render_futures = fetcher.fetch_all(contests_id, fetch_and_partition)
+                fetcher.close()
+        except request_errors() as e:
+            sys.exit("Could not retrieve the ranking data (.json) of the contest. Try again.")
+        except CacheMissError as e:
+            sys.exit(f"Error: {e}")
+        print("Generating files...")
+        output_filepaths = [future.result() for futures in render_futures for future in futures]
+
+    #----- show the information of output files ---------------------------------#
+    print("--------------------------------------------------")
+    print("[Output]")
+    for html_filepath in output_filepaths:
+        print(f"  - {html_filepath}")
+    print(f"  ({len(output_filepaths)} html files and the same number of _filtered.{args.filtered_format} files)")
+    print("Done.")
@@ -12,199 +12,121 @@
     - ./html/best_standings.html
       (the standings of the selected AtCoder contests)
 """
-import argparse
 import json
-import pandas as pd
-import pwinput
-import re
-import requests
+import standings_html
 import sys
-import textwrap
-import urllib.parse
-from time import sleep
+from atcoder_session import atcoder_url, open_session, open_session_store, prompt_password
+from filtered_output import filtered_filepath, filtered_formats, save_filtered
+from season_store import SeasonStore, season_path
+from standings_aggregate import BestScoreAggregator
+from standings_cache import CacheMissError, StandingsCache, standings_is_fixed
+from standings_fetcher import StandingsFetcher, request_errors, standings_url_format
+from standings_model import ContestStandings, UsernameTable
+from standings_stream import StandingsStream
+from standings_trace import tracer
 
 json_dir = "./json"
 html_dir = "./html"
-css_path = "../standings.css"
 standings_title = "Standings Title"
-atcoder_login_url = "https://atcoder.jp/login"
-
-#----- take arguments from the command line --------------------#
-parser = argparse.ArgumentParser()
-parser.add_argument("-a", "--affiliation")
-parser.add_argument("-c", "--contest_id", nargs = "+")    # accept one ore more arguments
-parser.add_argument("-u", "--username")
-parser.add_argument("-t", "--title", default = standings_title)
-args = parser.parse_args()
-
-def login_to_atcoder(username, password):
-    session = requests.session()
-    response = session.get(atcoder_login_url)                       # access with GET method to get cookies
-    revel_session = response.cookies.get_dict()["REVEL_SESSION"]    # get the cookie "REVEL_SESSION"
-    revel_session = urllib.parse.unquote(revel_session)             # decode "revel_session"
-    try:
-        csrf_token = re.search(r"csrf_token\:(.*)_TS", revel_session).groups()[0].replace("\x00\x00", "")    # randomly generated CSRF token when accessing login page (sometimes "AttributeError" occurs, then re-run the script when the error occurs)
-        sleep(1)
-    except AttributeError:
-        sys.exit("Could not retrieve csrf_token from the web page. Try again.")
-    
-    headers = {"content-type": "application/x-www-form-urlencoded"}
-    login_data = {
-      "username": username,
-      "password": password,
-      "csrf_token": csrf_token,
-    }
-    try:
-        response = session.post(atcoder_login_url, headers = headers, params = login_data)    # log in to AtCoder
-        response.raise_for_status()    # detect 4xx/5xx status code
-    except requests.exceptions.RequestException as e:
-        sys.exit("Error: ", e)
-    print("Successfully logged in to Atcoder!")
-    
-    return session
-
-def filter_by_affiliation(contest_id, affiliation, standings_data):
-    userinfo_list = []
-    users_number = len(standings_data)
 
-    for user_index in range(0, users_number):
-        if standings_data[user_index]["Affiliation"] == affiliation:
-            username = standings_data[user_index]["UserName"]
-            total_score = int(standings_data[user_index]["TotalResult"]["Score"] / 100)
-            userinfo_list.append({"UserName": username, "TotalScore": total_score, "ContestId": contest_id})
+def parse_arguments(argv = None):
+    import argparse    # not needed when imported as a module (benchmarks)
+    #----- take arguments from the command line --------------------#
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-a", "--affiliation")
+    parser.add_argument("-c", "--contest_id", nargs = "+")    # accept one ore more arguments
+    parser.add_argument("-u", "--username")
+    parser.add_argument("-t", "--title", default = standings_title)
+    parser.add_argument("-w", "--workers", type = int, default = 4)          # number of concurrent downloads
+    parser.add_argument("--rate_limit", type = float, default = 2.0)        # max requests per second to atcoder.jp (0: no limit)
+    parser.add_argument("--retries", type = int, default = 3)               # retries for connection errors, 429 and 5xx
+    parser.add_argument("--offline", action = "store_true")                  # read only from the cache (./json/cache), no login
+    parser.add_argument("--cache_size", type = int, default = 1024)          # max size of the cache in MiB
+    parser.add_argument("--season", nargs = "?", const = season_path)       # keep the results in a season database (default: ./json/season.sqlite3)
+    parser.add_argument("--replace", action = "store_true")                  # (season) fetch the contests again even if they are recorded
+    parser.add_argument("--remove", nargs = "+", default = [])              # (season) contest IDs to remove from the season
+    parser.add_argument("--filtered_format", choices = filtered_formats, default = "json")    # format of {contest_id}_filtered.*
+    parser.add_argument("--compact", action = "store_true")                  # write the filtered json without indentation
+    parser.add_argument("--aggregations", nargs = "+")                      # rankings to compute: max, sum_best:K, average, coverage (the first one orders the page)
+    parser.add_argument("--base_url", default = atcoder_url)                 # e.g. a local replay server (benchmarks/replay_server.py), no login
+    parser.add_argument("--no_session", action = "store_true")               # log in every time (do not reuse or save the session, see atcoder_session.py)
+    parser.add_argument("--profile_out", "--profile-out")                    # write the timing of each stage to this file (.jsonl: JSON Lines, otherwise Chrome trace)
+    return parser.parse_args(argv)
+
+def filter_by_affiliation(contest_id, affiliation, standings_data, usernames = None, filtered_format = "json", compact = False):
+    standings = ContestStandings(contest_id, [], usernames)    # only the total results are needed
+
+    with tracer.span("filter", contest_id = contest_id) as span:    # incl. downloading and decoding a StandingsStream
+        for participant in standings_data:    # a list or an iterator (e.g. StandingsStream(...)["StandingsData"])
+            if participant["Affiliation"] == affiliation:
+                standings.append(participant)
+        span.set(filtered = len(standings))
     
-    new_standings_data = {"UserInfo": userinfo_list}    # type: dict
-    with open(f"{json_dir}/{contest_id}_filtered.json", "w") as file:
-        json.dump(new_standings_data, fp = file, ensure_ascii = False, indent = 2)
+    new_standings_data = {"UserInfo": standings.userinfo(), "Standings": standings}    # type: dict ("Standings" is not saved)
+    with tracer.span("save_filtered", contest_id = contest_id, format = filtered_format):
+        save_filtered(filtered_filepath(json_dir, contest_id, filtered_format), new_standings_data["UserInfo"], filtered_format, compact)
     
     return new_standings_data
 
 def update_best_score(contests_number, standings_data):
-    reference_userinfo = standings_data[0]["UserInfo"]
-
-    for contest_index in range(1, contests_number):    # contest_index = 0 is for the reference
-        userinfo = standings_data[contest_index]["UserInfo"]    # type: list
-        users_number = len(userinfo)
-
-        for user_index in range(0, users_number):
-            username = userinfo[user_index]["UserName"]
-            total_score = userinfo[user_index]["TotalScore"]
-            contest_id = userinfo[user_index]["ContestId"]
-            
-            #----- check if the same username already exists --------------------------#
-            existsUserName = False
-            reference_username_index = 0
-            for item in reference_userinfo:
-                reference_username = item.get("UserName")
-                reference_total_score = item.get("TotalScore")
-                
-                if username == reference_username:
-                    existsUserName = True
-                    #----- update the TotalScore and the ContestId -------------------------------#
-                    if total_score > reference_total_score:
-                        standings_data[0]["UserInfo"][reference_username_index]["TotalScore"] = total_score
-                        standings_data[0]["UserInfo"][reference_username_index]["ContestId"] = contest_id
-                    break
-                reference_username_index += 1
-            if existsUserName == False:
-                standings_data[0]["UserInfo"].append({"UserName": username, "TotalScore": total_score, "ContestId": contest_id})
-    
-    #----- sort by "Rank" and then by "UserName" --------------------------#
-    userinfo = pd.DataFrame(standings_data[0]["UserInfo"])
-    userinfo = pd.concat([userinfo, userinfo.rank(ascending = False, method = "min")], axis = 1)
-    userinfo = userinfo.iloc[:, [0, 1, 2, 4]]
-    userinfo = userinfo.set_axis(["UserName", "TotalScore", "ContestId", "Rank"], axis = 1)
-    userinfo = userinfo.sort_values(["Rank", "UserName"])
-    userinfo = userinfo.reset_index(drop = True)
-
-    userinfo_list = []
-    for user_index in range(0, len(userinfo["UserName"])):
-        userinfo_list.append({"UserName": str(userinfo["UserName"][user_index]), "TotalScore": str(userinfo["TotalScore"][user_index]), "ContestId": str(userinfo["ContestId"][user_index]), "Rank": int(userinfo["Rank"][user_index])})
-    new_standings_data = {"UserInfo": userinfo_list}    # type: dict
-    with open(f"{json_dir}/best_standings.json", "w") as file:
-        json.dump(new_standings_data, fp = file, ensure_ascii = False, indent = 2)
+    #----- merge the contests one by one (UserName -> best TotalScore and its ContestId) ----------#
+    with tracer.span("merge", contests = contests_number):
+        aggregator = BestScoreAggregator()
+        for contest_index in range(0, contests_number):
+            aggregator.add_contest(standings_data[contest_index]["UserInfo"])
+
+        #----- sort by "Rank" and then by "UserName" --------------------------#
+        new_standings_data = {"UserInfo": aggregator.ranking()}    # type: dict
+    save_best_standings(new_standings_data)
     
     return new_standings_data
 
-def generate_standings_html(title, contests_id, affiliation, standings_data):
-    user_data = standings_data["UserInfo"]
-    users_number = len(user_data)
-    
-    #----- header -----------------------------------------------------------------#
-    headers = ["順位", "ユーザ", "総得点（最大値）"]
-    header_html =  "<thead>\n"
-    header_html += "  <tr>\n"
-    for header in headers:
-        header_html += f"    <th>{header}</th>\n"
-    header_html += "  </tr>\n"
-    header_html += "</thead>\n"
-    header_html = textwrap.indent(header_html, "      ")
-
-    #----- table ------------------------------------------------------------------#
-    table_html =  "<tbody>\n"
-    for user_index in range(users_number):
-        table_html += "  <tr>\n"
-        username = user_data[user_index].get("UserName")
-        total_score = user_data[user_index].get("TotalScore")
-        contest_id = user_data[user_index].get("ContestId")
-        contest_url = f"https://atcoder.jp/contests/{contest_id}"
-        rank = user_data[user_index].get("Rank")
-
-        table_html +=  f"    <td>{rank}</td>\n"
-        td_id = ""
-        if rank == 1:
-            td_id = "first"
-        elif rank == 2:
-            td_id = "second"
-        elif rank == 3:
-            td_id = "third"
-        table_html +=  f'    <td id="{td_id}">{username}</td>\n'
-        table_html +=  f'    <td>{total_score}<div class="contest_id">(<a href={contest_url} target="_blank" rel="noopener noreferrer">{contest_id}</a>)</td>\n'
-        table_html += "  </tr>\n"
-    table_html += "</tbody>\n"
-    table_html = textwrap.indent(table_html, "      ")
-
-    #----- combine into one html text ---------------------------------------------#
-    contests_label = ", ".join(map(str, contests_id))
-    standings_html = f"""
-                      <!DOCTYPE html>
-                      <html lang="ja">
-                        <head>
-                          <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
-                          <link href="{css_path}" rel="stylesheet" type="text/css" media="all">
-                        </head>
-                        <body>
-                          <h1>{title}</h1>
-                          <h2>コンテスト情報</h2>
-                          <div>
-                            <ul>
-                              <li>対象コンテスト：{contests_label}</li>
-                              <li>参加者総数：{users_number}名</li>
-                            </ul>
-                          </div>
-                          <h2>ランキング表（所属：{affiliation}）</h2>
-                          <table class="stripe-table">\n
-                      """
-    standings_html = textwrap.dedent(standings_html)[1:-1]
-    standings_html += header_html
-    standings_html += table_html
-    standings_html += "    </table>\n"
-    standings_html += "  </body>\n"
-    standings_html += "</html>"
-
-    with open(f"{html_dir}/best_standings.html", "w") as file:
-        file.write(standings_html)
+def save_best_standings(standings_data):
+    with tracer.span("save_best"), open(f"{json_dir}/best_standings.json", "w") as file:
+        json.dump(standings_data, fp = file, ensure_ascii = False, indent = 2)
+
+def aggregate_standings(contests_id, standings_data, usernames, aggregations):
+    #----- several rankings of the same contests at once (see aggregation_engine.py) -----#
+    from aggregation_engine import AggregationEngine    # numpy (only with --aggregations)
+    with tracer.span("merge", contests = len(contests_id), aggregations = len(aggregations)):
+        engine = AggregationEngine(aggregations)
+        for contest_id, new_standings_data in zip(contests_id, standings_data):
+            engine.add_contest(contest_id, new_standings_data["Standings"], new_standings_data.get("TasksNumber", 0))
+        new_standings_data = {"UserInfo": engine.ranking(usernames)}    # type: dict
+    save_best_standings(new_standings_data)
+
+    return new_standings_data
+
+def generate_standings_html(title, contests_id, affiliation, standings_data, aggregations = None):
+    #----- write html texts row by row (see standings_html.py) ------------------#
+    with tracer.span("render", rows = len(standings_data["UserInfo"])), open(f"{html_dir}/best_standings.html", "w") as file:
+        standings_html.write_best_page(file, title, contests_id, affiliation, standings_data["UserInfo"], aggregations)
+
+def main(args):
+    if args.profile_out is not None:
+        tracer.enable()
+    if args.aggregations is not None and args.season is not None:
+        sys.exit("Error: --aggregations cannot be used with --season (the season database keeps the best scores only).")
+    aggregations = None
+    if args.aggregations is not None:
+        from aggregation_engine import parse_aggregation
+        try:
+            aggregations = [parse_aggregation(spec) for spec in args.aggregations]
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
 
-if __name__ == "__main__":
     #----- log in to AtCoder ----------------------------------------------------#
-    print("[Enter login information]")
-    login_username = args.username
-    if login_username != None:
-        print("  Username: %s" % login_username)
-    else:
-        login_username = input("  Username: ")
-    login_password = pwinput.pwinput(prompt = "  Password: ")
-    session = login_to_atcoder(login_username, login_password)
+    session = None
+    if args.base_url != atcoder_url:
+        import requests
+        session = requests.session()
+    elif not args.offline:
+        print("[Enter login information]")
+        login_username = args.username
+        if login_username != None:
+            print("  Username: %s" % login_username)
+        session_store = None if args.no_session else open_session_store()
+        _, session = open_session(login_username, prompt_password, session_store, ask_username = lambda: input("  Username: "))
 
     #----- enter basic infomation to get contest results ------------------------#
     print("--------------------------------------------------")
@@ -220,33 +142,75 @@ if __name__ == "__main__":
     else:
         affiliation = input("  Affiliation: ")
     
-    standings_url = [f"https://atcoder.jp/contests/{id}/standings/json" for id in contests_id]
-    json_filepath = [f"{json_dir}/{id}.json" for id in contests_id]
+    #----- season mode: only the contests which are not recorded yet are fetched --#
+    season = None
+    fetch_contests_id = contests_id
+    if args.season is not None:
+        season = SeasonStore(args.season)
+        for contest_id in args.remove:
+            print(f"Removing {contest_id} from the season...")
+            season.remove_contest(affiliation, contest_id)
+        fetch_contests_id = [id for id in contests_id if args.replace or not season.has_contest(affiliation, id)]
+
+    standings_url = [standings_url_format.format(contest_id = id).replace(atcoder_url, args.base_url, 1) for id in fetch_contests_id]
     
     #----- prepare the standings data and generate json and html files ----------#
     title = args.title
-    new_standings_all_data = []
     standings_url_number = len(standings_url)
+    cache = StandingsCache(max_bytes = args.cache_size * 1024 * 1024, offline = args.offline)
+    fetcher = None if args.offline else StandingsFetcher(session, workers = args.workers, rate_limit = args.rate_limit, retries = args.retries)
+    usernames = UsernameTable()    # shared by all contests
+
+    def fetch_and_filter(url_index):
+        #----- filter the participants while the standings data is being downloaded ----#
+        standings_chunks = cache.fetch_chunks(fetch_contests_id[url_index], standings_url[url_index], fetcher, is_final = standings_is_fixed)
+        standings_stream = StandingsStream(standings_chunks)
+        new_standings_data = filter_by_affiliation(fetch_contests_id[url_index], affiliation, standings_stream["StandingsData"], usernames, args.filtered_format, args.compact)
+        standings_stream.parse_to_end()    # read the rest of the body so that it is saved in the cache
+        new_standings_data["TasksNumber"] = len(standings_stream["TaskInfo"])    # for --aggregations coverage
+        return new_standings_data
+
     try:
-        for url_index in range(0, standings_url_number):
-            url = standings_url[url_index]
+        for url in standings_url:
             print(f'Retrieving standings data from "{url}"...')
-            standings_data = session.get(url).text
-            #sleep(1)
-            new_standings_data = filter_by_affiliation(contests_id[url_index], affiliation, json.loads(standings_data)["StandingsData"])
-            new_standings_all_data.append(new_standings_data)
-
-        updated_standings_data = update_best_score(len(contests_id), new_standings_all_data)
+        if fetcher is None:
+            new_standings_all_data = [fetch_and_filter(url_index) for url_index in range(standings_url_number)]
+        else:
+            new_standings_all_data = fetcher.fetch_all(range(standings_url_number), fetch_and_filter)    # in the same order as contests_id
+            fetcher.close()
+
+        if season is None and aggregations is not None:
+            updated_standings_data = aggregate_standings(contests_id, new_standings_all_data, usernames, aggregations)
+        elif season is None:
+            updated_standings_data = update_best_score(len(contests_id), new_standings_all_data)
+        else:
+            with tracer.span("merge", contests = len(fetch_contests_id), season = True):
+                for contest_id, new_standings_data in zip(fetch_contests_id, new_standings_all_data):
+                    season.add_contest(affiliation, contest_id, new_standings_data["UserInfo"])    # updates only its participants
+                contests_id = season.contests(affiliation)
+                updated_standings_data = {"UserInfo": season.ranking(affiliation)}
+            save_best_standings(updated_standings_data)
+            season.close()
         print("Generating json and html files...")
-        generate_standings_html(title, contests_id, affiliation, updated_standings_data)
-    except requests.exceptions.RequestException as e:
+        generate_standings_html(title, contests_id, affiliation, updated_standings_data, aggregations)
+    except request_errors() as e:
         sys.exit("Could not retrieve the standings data (.json) of the contest. Try again.")
+    except CacheMissError as e:
+        sys.exit(f"Error: {e}")
 
     #----- show the information of output files ---------------------------------#
     print("--------------------------------------------------")
     print("[Output]")
-    for contest_id in contests_id:
-        print(f"  - {json_dir}/{contest_id}_filtered.json")
+    for contest_id in fetch_contests_id:
+        print(f"  - {filtered_filepath(json_dir, contest_id, args.filtered_format)}")
     print(f"  - {json_dir}/best_standings.json")
     print(f"  - {html_dir}/best_standings.html")
-    print("Done.")
\ No newline at end of file
+    if args.profile_out is not None:
+        tracer.write(args.profile_out)
+        print(f"  - {args.profile_out}")
+        print("[Profile]")
+        tracer.print_summary()
+    print("Done.")
+
+if __name__ == "__main__":
+    main(parse_arguments())
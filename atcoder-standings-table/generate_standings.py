@@ -9,191 +9,179 @@
     (Note that an AtCoder account is required.)
   - Output files are as follows:
     - ./json/{contest_id}.json
+    - ./json/{contest_id}_filtered.json (or .jsonl/.msgpack with --filtered_format)
     - ./html/{contest_id}.html
       (the standings of the selected AtCoder contest)
 """
 import datetime
-import json
-import pwinput
-import re
-import requests
+import io
+import os
+import standings_html
 import sys
-import textwrap
-import urllib.parse
-from bs4 import BeautifulSoup
-from time import sleep
+from atcoder_session import atcoder_url, open_session, open_session_store, prompt_password
+from filtered_output import filtered_filepath, filtered_formats, save_filtered
+from standings_cache import CacheMissError, StandingsCache, contest_page_is_over, standings_is_fixed
+from standings_fetcher import StandingsFetcher, request_errors, standings_url_format
+from standings_model import ContestStandings
+from standings_stream import StandingsStream
+from standings_trace import tracer
 
 json_dir = "./json"
 html_dir = "./html"
-css_path = "../standings.css"
-atcoder_login_url = "https://atcoder.jp/login"
 
-def login_to_atcoder(username, password):
-    session = requests.session()
-    response = session.get(atcoder_login_url)                       # access with GET method to get cookies
-    revel_session = response.cookies.get_dict()["REVEL_SESSION"]    # get the cookie "REVEL_SESSION"
-    revel_session = urllib.parse.unquote(revel_session)             # decode "revel_session"
-    
-    try:
-        csrf_token = re.search(r"csrf_token\:(.*)_TS", revel_session).groups()[0].replace("\x00\x00", "")    # randomly generated CSRF token when accessing login page (sometimes "AttributeError" occurs, then re-run the script when the error occurs)
-        sleep(1)
-    except AttributeError:
-        sys.exit("Could not retrieve csrf_token from the web page. Try again.")
-    headers = {"content-type": "application/x-www-form-urlencoded"}
-    login_data = {
-      "username": username,
-      "password": password,
-      "csrf_token": csrf_token,
-    }
-    try:
-        response = session.post(atcoder_login_url, headers = headers, params = login_data)
-        response.raise_for_status()    # detect 4xx/5xx status code
-    except requests.exceptions.RequestException as e:
-        sys.exit("Error: ", e)
-    print("Successfully logged in to Atcoder!")
-    
-    return session
+def retrieve_contest_info(contest_id, cache = None, fetcher = None, contest_url = None):
+    if contest_url is None:
+        contest_url = f"{atcoder_url}/contests/{contest_id}/"
+    if cache is None:
+        import urllib.request
+        contest_page = urllib.request.urlopen(contest_url).read()
+    else:
+        contest_page = cache.fetch(contest_id, contest_url, fetcher, is_final = contest_page_is_over)
+        contest_info = cache.get_derived(contest_id, contest_url, "contest_info")    # parsed result of the same page
+        if contest_info is not None:
+            return contest_info
 
-def arrange_standings_html(contest_id, affiliation, standings_all_json):
-    standings_data = standings_all_json["StandingsData"]
-    problems_data = standings_all_json["TaskInfo"]
-    participants_number = len(standings_data)
-    problems_number = len(problems_data)
-    problems_urls =  [f"https://atcoder.jp/contests/{contest_id}/tasks/{contest_id}_" + chr(i + 97) for i in range(0, problems_number)]
-    
-    #----- retrieve the contest date and time --------------------------------------------------#
-    contest_url = f"https://atcoder.jp/contests/{contest_id}/"
-    soup = BeautifulSoup(urllib.request.urlopen(contest_url), "html.parser")
-    contest_title = soup.title.string
+    from bs4 import BeautifulSoup    # only when the page is not in the cache
+    soup = BeautifulSoup(contest_page, "html.parser")
     contest_datetime = soup.find_all("time", class_ = "fixtime fixtime-full")    # refer to the tag <time class="fixtime fixtime-full"> to get the AtCoder contest date
     time_format = "%Y/%m/%d %H:%M"
-    contest_start_time = datetime.datetime.strptime(contest_datetime[0].string, "%Y-%m-%d %H:%M:%S%z").strftime(time_format)    # e.g. 2023-01-01 23:59:59+09:00 -> 2023/01/01 23:59:59
-    contest_end_time = datetime.datetime.strptime(contest_datetime[1].string, "%Y-%m-%d %H:%M:%S%z").strftime(time_format)
+    contest_info = {
+      "title": soup.title.string,
+      "start_time": datetime.datetime.strptime(contest_datetime[0].string, "%Y-%m-%d %H:%M:%S%z").strftime(time_format),    # e.g. 2023-01-01 23:59:59+09:00 -> 2023/01/01 23:59:59
+      "end_time": datetime.datetime.strptime(contest_datetime[1].string, "%Y-%m-%d %H:%M:%S%z").strftime(time_format),
+    }
+    if cache is not None:
+        cache.set_derived(contest_id, contest_url, "contest_info", contest_info)
+
+    return contest_info
+
+def arrange_standings_html(contest_id, affiliation, standings_all_json, contest_info = None, file = None, filtered_format = "json", compact = False):
+    """Write the standings page to `file` (or return it as a string if `file` is None)."""
+    #----- filter the participants by affiliation in one pass (standings_all_json may be a StandingsStream) -----#
+    with tracer.span("filter", contest_id = contest_id) as span:    # incl. downloading and decoding a StandingsStream
+        participants_number = 0
+        standings_data = []    # participants of the affiliation
+        for participant in standings_all_json["StandingsData"]:
+            participants_number += 1
+            if participant["Affiliation"] == affiliation:
+                standings_data.append(participant)
+        problems_data = standings_all_json["TaskInfo"]    # read after "StandingsData" (see standings_stream.py)
+        span.set(participants = participants_number, filtered = len(standings_data))
     
-    #----- prepare table header html texts -----------------------------------------------------#
-    headers = ["順位", "ユーザ", "総得点"]
-    for i in range(0, problems_number):
-        headers.append(chr(i + 65))    # e.g. i = 0 -> A, i = 1 -> B, ...
-    header_html =  "<thead>\n"
-    header_html += "  <tr>\n"
-    for header_index in range(len(headers)):
-        if header_index <= 2:
-            header_html += f"    <th>{headers[header_index]}</th>\n"
-        else:
-            header_html += f'    <th><a href="{problems_urls[header_index - 3]}" target="_blank" rel="noopener noreferrer">{headers[header_index]}</a></th>\n'
-    header_html += "  </tr>\n"
-    header_html += "</thead>\n"
-    header_html = textwrap.indent(header_html, "      ")
+    #----- retrieve the contest date and time --------------------------------------------------#
+    if contest_info is None:
+        with tracer.span("contest_info", contest_id = contest_id):
+            contest_info = retrieve_contest_info(contest_id)
     
-    #----- prepare table html texts ------------------------------------------------------------#
-    table_html = "<tbody>\n"
-    filtered_json_filepath = f"{json_dir}/{contest_id}_filtered.json"
-    with open(filtered_json_filepath, "w") as file:
-        file.write("")    # create an empty file
-    for participant_index in range(0, participants_number):
-        if standings_data[participant_index]["Affiliation"] == affiliation:
-            with open(filtered_json_filepath, "a") as file:    # save filtered standings json data
-                json.dump(standings_data[participant_index], fp = file, ensure_ascii = False, indent = 2)
+    #----- save filtered standings json data and write html texts row by row ------------------#
+    with tracer.span("save_filtered", contest_id = contest_id, format = filtered_format):
+        save_filtered_standings(filtered_filepath(json_dir, contest_id, filtered_format), standings_data, filtered_format, compact)
+    with tracer.span("render", contest_id = contest_id, rows = len(standings_data)):
+        if file is None:
+            with io.StringIO() as string_file:
+                write_standings_html(string_file, contest_id, affiliation, problems_data, standings_data, participants_number, contest_info)
+                return string_file.getvalue()
+        write_standings_html(file, contest_id, affiliation, problems_data, standings_data, participants_number, contest_info)
 
-            contents = []
-            rank = standings_data[participant_index]["Rank"]
-            username = standings_data[participant_index]["UserName"]
-            total_score = int(standings_data[participant_index]["TotalResult"]["Score"] / 100)
-            total_elapsed = standings_data[participant_index]["TotalResult"]["Elapsed"]    # nano second
-            total_elapsed_hhmmss = str(datetime.timedelta(microseconds = total_elapsed * 1.0e-3))
-            contents = [rank, username, total_score, total_elapsed_hhmmss]
+def save_filtered_standings(filtered_json_filepath, standings_data, filtered_format = "json", compact = False):
+    #----- {"UserInfo": [participant, ...]} (the same format as generate_best_standings.py) -----#
+    save_filtered(filtered_json_filepath, standings_data, filtered_format, compact)
 
-            #----- get score and time for each problem ------------------------------#
-            for problem_number in range(0, problems_number):
-                problem_name = contest_id + "_" + chr(problem_number + 97)
-                user_task_results_each_problem = standings_data[participant_index]["TaskResults"].get(problem_name)    # if the data doesn't exist, return None using get method
-                if user_task_results_each_problem != None:
-                    score = user_task_results_each_problem["Score"]
-                    time = user_task_results_each_problem["Elapsed"]
-                    contents.append(int(score * 1.0e-2))                                      # score
-                    contents.append(str(datetime.timedelta(microseconds = time * 1.0e-3)))    # time
-                else:
-                    contents += ["-", "-"]
+def write_standings_html(file, contest_id, affiliation, problems_data, standings_data, participants_number, contest_info, css_path = standings_html.css_path):
+    standings = ContestStandings(contest_id, problems_data)    # columnar model (task columns from "TaskInfo")
+    standings.extend(standings_data)
+    standings_html.write_contest_page(file, contest_id, contest_info, affiliation, participants_number, standings, css_path)
 
-            #----- format html texts ------------------------------------------------#
-            table_html += "  <tr>\n"
-            for header_index in range(len(headers)):
-                if header_index <= 1:
-                    table_html +=  f"    <td>{contents[header_index]}</td>\n"
-                else:
-                    score, time = contents[2 * header_index - 2], contents[2 * header_index - 1]
-                    if score == 0 or time == "0:00:00" or score == "-" or time == "-":
-                        table_html += "    <td>-</td>\n"
-                    elif score != "-":
-                        if header_index == 2:
-                            table_html +=  f'    <td><div class="total-score">{score}</div><div class="time">{time}</font></td>\n'
-                        else:
-                            table_html +=  f'    <td><div class="score">{score}</div><div class="time">{time}</div></td>\n'
-            table_html += "  </tr>\n"
-    table_html += "</tbody>\n"
-    table_html = textwrap.indent(table_html, "      ")
-    
-    #----- combine into one html text ----------------------------------------------------------#
-    standings_html = f"""
-                      <!DOCTYPE html>
-                      <html lang="ja">
-                        <head>
-                          <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
-                          <link href="{css_path}" rel="stylesheet" type="text/css" media="all">
-                        </head>
-                        <body>
-                          <h1>{contest_title}</h1>
-                          <h2>コンテスト情報</h2>
-                          <div>
-                            <ul>
-                              <li>開催日時：{contest_start_time} - {contest_end_time}</li>
-                              <li>参加者総数：{participants_number}名</li>
-                            </ul>
-                            ※詳細は<a href="{contest_url}" target="_blank" rel="noopener noreferrer">公式ページ</a>を参照のこと。
-                          </div>
-                          <h2>ランキング表（所属：{affiliation}）</h2>
-                          <table class="stripe-table">\n
-                      """
-    standings_html = textwrap.dedent(standings_html)[1:-1]
-    standings_html += header_html
-    standings_html += table_html
-    standings_html += "    </table>\n"
-    standings_html += "  </body>\n"
-    standings_html += "</html>"
-    
-    return standings_html
+def parse_arguments(argv = None):
+    import argparse    # not needed when imported as a module (generate_batch_standings.py, benchmarks)
+    #----- take arguments from the command line ------------------------------#
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--offline", action = "store_true")                  # read only from the cache (./json/cache), no login
+    parser.add_argument("--cache_size", type = int, default = 1024)          # max size of the cache in MiB
+    parser.add_argument("--filtered_format", choices = filtered_formats, default = "json")    # format of {contest_id}_filtered.*
+    parser.add_argument("--compact", action = "store_true")                  # write the filtered json without indentation
+    parser.add_argument("--watch", type = float, metavar = "SECONDS")        # poll the standings every SECONDS and update the html (live standings)
+    parser.add_argument("--cycles", type = int, default = 0)                 # (watch) stop after this number of polls (0: until the standings are fixed)
+    parser.add_argument("--watch_log")                                       # (watch) append the poll/render latency of each cycle to this file (JSON Lines)
+    parser.add_argument("--record")                                          # (watch) save each modified standings json to this directory
+    parser.add_argument("--base_url", default = atcoder_url)                 # e.g. a local replay server (benchmarks/replay_server.py), no login
+    parser.add_argument("--no_session", action = "store_true")               # log in every time (do not reuse or save the session, see atcoder_session.py)
+    parser.add_argument("--profile_out", "--profile-out")                    # write the timing of each stage to this file (.jsonl: JSON Lines, otherwise Chrome trace)
+    return parser.parse_args(argv)
+
+def main(args):
+    if args.profile_out is not None:
+        tracer.enable()
+    if args.watch is not None and args.offline:
+        sys.exit("Error: --watch cannot be used with --offline.")
 
-if __name__ == "__main__":
     #----- log in to AtCoder --------------------------------------------------#
-    print("[Enter login information]")
-    login_username = input("  Username: ")
-    login_password = pwinput.pwinput(prompt = "  Password: ")
-    session = login_to_atcoder(login_username, login_password)
+    session = None
+    if args.base_url != atcoder_url:
+        import requests
+        session = requests.session()
+    elif not args.offline:
+        print("[Enter login information]")
+        session_store = None if args.no_session else open_session_store()
+        _, session = open_session(None, prompt_password, session_store, ask_username = lambda: input("  Username: "))
     
     #----- enter basic infomation to get the certain contest results ----------#
     print("--------------------------------------------------")
     print("[Enter the following basic information]")
     contest_id = input("  Contest ID: ")
     affiliation = input("  Affiliation: ")
-    standings_url = f"https://atcoder.jp/contests/{contest_id}/standings/json"
+    standings_url = standings_url_format.format(contest_id = contest_id).replace(atcoder_url, args.base_url, 1)
     
     json_filepath = f"{json_dir}/{contest_id}.json"    
+    html_filepath = f"{html_dir}/{contest_id}.html"
+    cache = StandingsCache(max_bytes = args.cache_size * 1024 * 1024, offline = args.offline)
+    fetcher = None if args.offline else StandingsFetcher(session, workers = 1)
     try:
-        standings_all_data = session.get(standings_url).text
-        with open(json_filepath, "w") as file:    # save the all standings data of the specific contest
-            json.dump(json.loads(standings_all_data), fp = file, ensure_ascii = False, indent = 2)
-    except requests.exceptions.RequestException as e:
+        with tracer.span("contest_info", contest_id = contest_id):
+            contest_info = retrieve_contest_info(contest_id, cache, fetcher, f"{args.base_url}/contests/{contest_id}/")
+        if args.watch is not None:
+            if args.record is not None:
+                os.makedirs(args.record, exist_ok = True)
+            from standings_watch import StandingsWatcher
+            watcher = StandingsWatcher(contest_id, affiliation, contest_info, standings_url, fetcher, html_filepath, json_filepath,
+                                       filtered_filepath(json_dir, contest_id, args.filtered_format), args.filtered_format, args.compact,
+                                       log_filepath = args.watch_log, record_dir = args.record)
+            print(f"Watching the standings every {args.watch} seconds (Ctrl+C to stop)...")
+            try:
+                watcher.run(args.watch, args.cycles)
+            except KeyboardInterrupt:
+                print("Stopped.")
+        else:
+            print("Generating files...")
+            temp_json_filepath = f"{json_filepath}.tmp"    # the previous files are kept if the download fails
+            temp_html_filepath = f"{html_filepath}.tmp"
+            try:
+                with open(temp_json_filepath, "wb") as json_file, open(temp_html_filepath, "w") as html_file:    # save the all standings data of the specific contest as it is downloaded
+                    standings_chunks = cache.fetch_chunks(contest_id, standings_url, fetcher, is_final = standings_is_fixed)
+                    standings_all_json = StandingsStream(standings_chunks, raw_file = json_file)    # parsed while downloading
+                    arrange_standings_html(contest_id, affiliation, standings_all_json, contest_info, html_file, args.filtered_format, args.compact)
+                os.replace(temp_json_filepath, json_filepath)
+                os.replace(temp_html_filepath, html_filepath)
+            finally:
+                for temp_filepath in (temp_json_filepath, temp_html_filepath):
+                    if os.path.exists(temp_filepath):
+                        os.remove(temp_filepath)
+    except request_errors() as e:
         sys.exit("Could not retrieve the ranking data (.json) of the contest. Try again.")
+    except CacheMissError as e:
+        sys.exit(f"Error: {e}")
 
-    print("Generating files...")
-    standings_all_json = json.loads(standings_all_data)
-    arranged_standings_html = arrange_standings_html(contest_id, affiliation, standings_all_json)
-
-    html_filepath = f"{html_dir}/{contest_id}.html"
-    with open(html_filepath, "w") as file:
-        file.write(arranged_standings_html)
     print("--------------------------------------------------")
     print("[Output]")
     print("  - %s" % html_filepath)
     print("  - %s" % json_filepath)
-    print("Done.")
\ No newline at end of file
+    print("  - %s" % filtered_filepath(json_dir, contest_id, args.filtered_format))
+    if args.profile_out is not None:
+        tracer.write(args.profile_out)
+        print("  - %s" % args.profile_out)
+        print("[Profile]")
+        tracer.print_summary()
+    print("Done.")
+
+if __name__ == "__main__":
+    main(parse_arguments())
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: season_store.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Persistent "season" database (SQLite) for generate_best_standings.py.
+    The filtered results of each contest (the output of filter_by_affiliation)
+    are recorded once, and the best score of each user is kept in a
+    materialized table, so adding a contest only touches its participants.
+  - Contests can be removed or replaced; then the best scores of the affected
+    users are recomputed from the remaining contests.
+  - The ranking has the same rules as BestScoreAggregator (standings_aggregate.py):
+    ties keep the contest added first, ranks are "min" ranks, then sorted by UserName.
+  - File: ./json/season.sqlite3 (one file can hold several affiliations)
+"""
+import sqlite3
+import time
+
+season_path = "./json/season.sqlite3"
+
+schema = """
+CREATE TABLE IF NOT EXISTS contests (
+  affiliation TEXT NOT NULL,
+  contest_id TEXT NOT NULL,
+  position INTEGER NOT NULL,    -- order in which the contest was added (earlier wins ties)
+  added_at REAL NOT NULL,
+  PRIMARY KEY (affiliation, contest_id)
+);
+CREATE TABLE IF NOT EXISTS contest_results (
+  affiliation TEXT NOT NULL,
+  contest_id TEXT NOT NULL,
+  username TEXT NOT NULL,
+  total_score INTEGER NOT NULL,
+  PRIMARY KEY (affiliation, contest_id, username)
+);
+CREATE INDEX IF NOT EXISTS contest_results_by_user ON contest_results (affiliation, username);
+CREATE TABLE IF NOT EXISTS best_scores (
+  affiliation TEXT NOT NULL,
+  username TEXT NOT NULL,
+  total_score INTEGER NOT NULL,
+  contest_id TEXT NOT NULL,
+  position INTEGER NOT NULL,
+  PRIMARY KEY (affiliation, username)
+);
+CREATE INDEX IF NOT EXISTS best_scores_ranking ON best_scores (affiliation, total_score DESC, username);
+"""
+
+class SeasonStore:
+    def __init__(self, path = season_path):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def contests(self, affiliation):
+        """Return the contest IDs of the season in the order they were added."""
+        rows = self.connection.execute("SELECT contest_id FROM contests WHERE affiliation = ? ORDER BY position", (affiliation,))
+        return [contest_id for (contest_id,) in rows]
+
+    def has_contest(self, affiliation, contest_id):
+        row = self.connection.execute("SELECT 1 FROM contests WHERE affiliation = ? AND contest_id = ?", (affiliation, contest_id)).fetchone()
+        return row is not None
+
+    def add_contest(self, affiliation, contest_id, userinfo):
+        """Record the filtered results of a contest ([{"UserName", "TotalScore", ...}]).
+        If the contest is already recorded, its results are replaced (its position is kept)."""
+        with self.connection:    # one transaction
+            row = self.connection.execute("SELECT position FROM contests WHERE affiliation = ? AND contest_id = ?", (affiliation, contest_id)).fetchone()
+            if row is not None:
+                self.remove_results(affiliation, contest_id)
+                position = row[0]
+            else:
+                (position,) = self.connection.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM contests WHERE affiliation = ?", (affiliation,)).fetchone()
+                self.connection.execute("INSERT INTO contests VALUES (?, ?, ?, ?)", (affiliation, contest_id, position, time.time()))
+
+            results = [(affiliation, contest_id, user["UserName"], user["TotalScore"]) for user in userinfo]
+            self.connection.executemany("INSERT INTO contest_results VALUES (?, ?, ?, ?)", results)
+            #----- update the best scores of the participants only (earlier contests win ties) -----#
+            self.connection.executemany("""
+                INSERT INTO best_scores VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (affiliation, username) DO UPDATE SET
+                  total_score = excluded.total_score, contest_id = excluded.contest_id, position = excluded.position
+                WHERE excluded.total_score > best_scores.total_score
+                   OR (excluded.total_score = best_scores.total_score AND excluded.position < best_scores.position)
+            """, [(affiliation, username, total_score, contest_id, position) for (_, _, username, total_score) in results])
+
+    def remove_contest(self, affiliation, contest_id):
+        with self.connection:
+            self.remove_results(affiliation, contest_id)
+            self.connection.execute("DELETE FROM contests WHERE affiliation = ? AND contest_id = ?", (affiliation, contest_id))
+
+    def remove_results(self, affiliation, contest_id):
+        #----- delete the results of a contest and recompute the best scores of its participants (in a transaction) -----#
+        usernames = [username for (username,) in self.connection.execute(
+            "SELECT username FROM contest_results WHERE affiliation = ? AND contest_id = ?", (affiliation, contest_id))]
+        self.connection.execute("DELETE FROM contest_results WHERE affiliation = ? AND contest_id = ?", (affiliation, contest_id))
+        for username in usernames:
+            best = self.connection.execute("""
+                SELECT r.total_score, r.contest_id, c.position FROM contest_results AS r
+                JOIN contests AS c ON c.affiliation = r.affiliation AND c.contest_id = r.contest_id
+                WHERE r.affiliation = ? AND r.username = ? AND r.contest_id != ?
+                ORDER BY r.total_score DESC, c.position ASC LIMIT 1
+            """, (affiliation, username, contest_id)).fetchone()
+            if best is None:
+                self.connection.execute("DELETE FROM best_scores WHERE affiliation = ? AND username = ?", (affiliation, username))
+            else:
+                self.connection.execute("UPDATE best_scores SET total_score = ?, contest_id = ?, position = ? WHERE affiliation = ? AND username = ?", (*best, affiliation, username))
+
+    def ranking(self, affiliation):
+        """Return [{"UserName", "TotalScore", "ContestId", "Rank"}] like BestScoreAggregator.ranking()."""
+        rows = self.connection.execute(
+            "SELECT username, total_score, contest_id FROM best_scores WHERE affiliation = ? ORDER BY total_score DESC, username",
+            (affiliation,))
+        userinfo_list = []
+        rank, previous_score = 0, None
+        for position, (username, total_score, contest_id) in enumerate(rows, start = 1):
+            if total_score != previous_score:
+                rank, previous_score = position, total_score
+            userinfo_list.append({"UserName": str(username), "TotalScore": str(total_score), "ContestId": str(contest_id), "Rank": rank})
+
+        return userinfo_list
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_aggregate.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Aggregate the filtered results of several contests into one ranking.
+    The filtered results ({"UserName", "TotalScore", "ContestId"}) are fed
+    one contest at a time and merged with a hash index keyed by UserName,
+    so each contest costs O(number of its users).
+  - The ranking is built once at the end: users are ranked by TotalScore
+    (ties share the smallest rank, i.e. method = "min") and then sorted by UserName.
+  - Several rankings at once (--aggregations) are computed by aggregation_engine.py.
+"""
+
+class BestScoreAggregator:
+    """Keep the best TotalScore of each user and the contest where it was achieved."""
+
+    def __init__(self):
+        self.best = {}    # UserName -> [TotalScore, ContestId]
+
+    def __len__(self):
+        return len(self.best)
+
+    def add_contest(self, userinfo):
+        best = self.best
+        for user in userinfo:
+            username = user["UserName"]
+            total_score = user["TotalScore"]
+            current = best.get(username)
+            if current is None:
+                best[username] = [total_score, user["ContestId"]]
+            elif total_score > current[0]:    # keep the earlier contest when the scores are the same
+                current[0] = total_score
+                current[1] = user["ContestId"]
+
+    def ranking(self):
+        """Return [{"UserName", "TotalScore", "ContestId", "Rank"}] sorted by Rank and then by UserName."""
+        entries = sorted(self.best.items(), key = lambda item: (-item[1][0], item[0]))
+        userinfo_list = []
+        rank, previous_score = 0, None
+        for position, (username, (total_score, contest_id)) in enumerate(entries, start = 1):
+            if total_score != previous_score:
+                rank, previous_score = position, total_score
+            userinfo_list.append({"UserName": str(username), "TotalScore": str(total_score), "ContestId": str(contest_id), "Rank": rank})
+
+        return userinfo_list
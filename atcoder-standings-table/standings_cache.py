@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_cache.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - On-disk cache for the standings data (.json) and the contest pages.
+    Each entry is keyed by (contest ID, URL) and points to a content-addressed
+    blob (the SHA-256 of the body), so identical bodies are stored only once.
+  - Entries are revalidated with ETag/Last-Modified (conditional GET).
+    Entries whose contest is over are marked "final" and never refetched.
+  - When the blobs exceed the size limit, the least recently used entries are evicted.
+  - In offline mode, only the cache is read and nothing is downloaded.
+  - Files are as follows:
+    - ./json/cache/index.json
+    - ./json/cache/blobs/{sha256}
+"""
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from standings_trace import tracer
+
+cache_dir = "./json/cache"
+default_max_bytes = 1024 * 1024 * 1024    # 1 GiB
+
+class CacheMissError(LookupError):
+    """Raised in offline mode when the requested entry is not cached."""
+
+def standings_is_fixed(content):
+    #----- AtCoder puts "Fixed":true at the head of the standings json once the results are final -----#
+    return re.search(rb'"Fixed"\s*:\s*true', content[:256]) is not None
+
+def contest_page_is_over(content):
+    #----- the second <time class="fixtime fixtime-full"> of the contest page is the end time -----#
+    times = re.findall(rb'<time class="fixtime fixtime-full">([^<]+)</time>', content)
+    if len(times) < 2:
+        return False
+    end_time = datetime.datetime.strptime(times[1].decode(), "%Y-%m-%d %H:%M:%S%z")
+    return end_time < datetime.datetime.now(datetime.timezone.utc)
+
+class StandingsCache:
+    def __init__(self, directory = cache_dir, max_bytes = default_max_bytes, offline = False):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.index_path = os.path.join(directory, "index.json")
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        os.makedirs(self.blob_dir, exist_ok = True)
+        try:
+            with open(self.index_path) as file:
+                self.index = json.load(file)    # key -> entry (dict)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.index = {}
+
+    @staticmethod
+    def entry_key(contest_id, url):
+        return hashlib.sha256(f"{contest_id}\n{url}".encode()).hexdigest()
+
+    def blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest)
+
+    def save_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.index, fp = file, ensure_ascii = False)
+        os.replace(temp_path, self.index_path)
+
+    def lookup(self, contest_id, url):
+        with self.lock:
+            entry = self.index.get(self.entry_key(contest_id, url))
+            if entry is not None and not os.path.exists(self.blob_path(entry["digest"])):
+                return None    # the blob was removed by hand
+            return entry
+
+    def touch(self, contest_id, url):
+        with self.lock:
+            entry = self.index[self.entry_key(contest_id, url)]
+            entry["last_access"] = time.time()
+            self.save_index()
+
+    def read(self, entry):
+        with open(self.blob_path(entry["digest"]), "rb") as file:
+            return file.read()
+
+    def store(self, contest_id, url, content, etag = None, last_modified = None, final = False):
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(content)
+            os.replace(temp_path, path)
+        self.register(contest_id, url, digest, len(content), etag, last_modified, final)
+
+    def register(self, contest_id, url, digest, size, etag, last_modified, final):
+        with self.lock:
+            key = self.entry_key(contest_id, url)
+            previous = self.index.get(key, {})
+            self.index[key] = {
+              "contest_id": contest_id,
+              "url": url,
+              "digest": digest,
+              "size": size,
+              "etag": etag,
+              "last_modified": last_modified,
+              "final": final,
+              "last_access": time.time(),
+              "derived": previous.get("derived", {}) if previous.get("digest") == digest else {},
+            }
+            if previous.get("digest") not in (None, digest):
+                self.release_blob(previous["digest"])    # the former body of the entry
+            self.evict()
+            self.save_index()
+
+    def evict(self):
+        #----- remove the least recently used entries until the blobs fit in max_bytes (lock must be held) -----#
+        blob_sizes = {entry["digest"]: entry["size"] for entry in self.index.values()}
+        total_bytes = sum(blob_sizes.values())
+        for key, entry in sorted(self.index.items(), key = lambda item: item[1]["last_access"]):
+            if total_bytes <= self.max_bytes or len(self.index) == 1:
+                break
+            del self.index[key]
+            if self.release_blob(entry["digest"]):
+                total_bytes -= entry["size"]
+
+    def release_blob(self, digest):
+        #----- remove the blob unless another entry still points to it; return True if removed (lock must be held) -----#
+        if any(entry["digest"] == digest for entry in self.index.values()):
+            return False
+        try:
+            os.remove(self.blob_path(digest))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidated(self, entry, head, is_final):
+        #----- the server answered 304 Not Modified -----#
+        with self.lock:
+            entry["final"] = is_final(head) if is_final is not None else False
+            entry["last_access"] = time.time()
+            self.save_index()
+
+    def fetch(self, contest_id, url, fetcher = None, is_final = None):
+        """Return the body (bytes) of `url`, downloading it with `fetcher.get(url, headers)`
+        only when the cached entry is missing or out of date."""
+        entry = self.lookup(contest_id, url)
+        if entry is not None and (entry["final"] or self.offline):
+            self.touch(contest_id, url)
+            return self.read(entry)
+        if self.offline or fetcher is None:
+            raise CacheMissError(f'"{url}" ({contest_id}) is not in the cache ({self.directory}).')
+
+        response = fetcher.get(url, headers = self.conditional_headers(entry))    # traced as "http.get" (incl. the body)
+        if response.status_code == 304 and entry is not None:
+            content = self.read(entry)
+            self.revalidated(entry, content, is_final)
+            return content
+
+        content = response.content
+        final = is_final(content) if is_final is not None else False
+        self.store(contest_id, url, content, response.headers.get("ETag"), response.headers.get("Last-Modified"), final)
+        return content
+
+    def fetch_chunks(self, contest_id, url, fetcher = None, is_final = None, chunk_size = 64 * 1024):
+        """Same as fetch(), but yield the body in chunks as they arrive from the socket
+        (or from the cached blob). `is_final` receives only the first chunk."""
+        entry = self.lookup(contest_id, url)
+        if entry is not None and (entry["final"] or self.offline):
+            self.touch(contest_id, url)
+            with tracer.span("cache.read", contest_id = contest_id, bytes = entry["size"]):
+                yield from self.read_chunks(entry, chunk_size)
+            return
+        if self.offline or fetcher is None:
+            raise CacheMissError(f'"{url}" ({contest_id}) is not in the cache ({self.directory}).')
+
+        with fetcher.get(url, headers = self.conditional_headers(entry), stream = True) as response:
+            if response.status_code == 304 and entry is not None:
+                head = next(self.read_chunks(entry, chunk_size), b"")
+                self.revalidated(entry, head, is_final)
+                with tracer.span("cache.read", contest_id = contest_id, bytes = entry["size"], revalidated = True):
+                    yield from self.read_chunks(entry, chunk_size)
+                return
+
+            #----- save the body to a temporary blob while passing it to the caller -----#
+            digest = hashlib.sha256()
+            size, head = 0, None
+            temp_path = os.path.join(self.blob_dir, f"download.{threading.get_ident()}.tmp")
+            try:
+                with tracer.span("download", contest_id = contest_id) as span, open(temp_path, "wb") as file:    # overlaps with the parsing by the caller
+                    for chunk in response.iter_content(chunk_size):
+                        if head is None:
+                            head = chunk
+                        digest.update(chunk)
+                        file.write(chunk)
+                        size += len(chunk)
+                        yield chunk
+                    span.set(bytes = size)
+                os.replace(temp_path, self.blob_path(digest.hexdigest()))
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            final = is_final(head or b"") if is_final is not None else False
+            self.register(contest_id, url, digest.hexdigest(), size, response.headers.get("ETag"), response.headers.get("Last-Modified"), final)
+
+    def read_chunks(self, entry, chunk_size):
+        with open(self.blob_path(entry["digest"]), "rb") as file:
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def get_derived(self, contest_id, url, name):
+        """Return a value derived from the cached body (e.g. parsed contest information), if any."""
+        entry = self.lookup(contest_id, url)
+        return None if entry is None else entry["derived"].get(name)
+
+    def set_derived(self, contest_id, url, name, value):
+        with self.lock:
+            entry = self.index.get(self.entry_key(contest_id, url))
+            if entry is not None:
+                entry["derived"][name] = value
+                self.save_index()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_fetcher.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Fetch the standings data (.json) of several AtCoder contests concurrently.
+    Each worker thread gets its own HTTP session (connection pool) that starts
+    with the cookies of the logged-in session returned by login_to_atcoder().
+  - Requests to the same host are spaced by a rate limit, and failed requests
+    (connection errors, timeouts, 429 and 5xx) are retried with exponential backoff.
+  - Results are returned in the same order as the given URLs.
+  - requests is imported when the first fetcher is created (not needed offline).
+"""
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from standings_trace import tracer
+
+standings_url_format = "https://atcoder.jp/contests/{contest_id}/standings/json"
+retry_status_codes = {429, 500, 502, 503, 504}
+
+def request_errors():
+    #----- for "except request_errors():" -- () (matches nothing) if requests has not been imported, i.e. nothing was downloaded -----#
+    requests = sys.modules.get("requests")
+    return requests.exceptions.RequestException if requests is not None else ()
+
+class HostRateLimiter:
+    """Allow at most `rate` requests per second for each host (rate <= 0: no limit)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_time = {}    # host -> the earliest time when the next request can be sent
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        if self.interval == 0.0:
+            return
+        host = urllib.parse.urlsplit(url).netloc
+        with self.lock:    # reserve a time slot, then sleep outside the lock
+            now = time.monotonic()
+            slot = max(now, self.next_time.get(host, now))
+            self.next_time[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class StandingsFetcher:
+    """Concurrent HTTP GET engine sharing the cookies of a logged-in session."""
+
+    def __init__(self, session, workers = 4, rate_limit = 2.0, retries = 3, backoff = 1.0, timeout = 60):
+        import requests
+        self.requests = requests
+        self.session = session
+        self.workers = max(1, workers)
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.local = threading.local()
+        self.sessions = []
+        self.sessions_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self.sessions_lock:
+            for session in self.sessions:
+                session.close()
+            self.sessions = []
+
+    def thread_session(self):
+        #----- one session (connection pool) per worker thread, cookies copied from the login session -----#
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.requests.Session()
+            session.headers.update(self.session.headers)
+            session.cookies.update(self.session.cookies)
+            self.local.session = session
+            with self.sessions_lock:
+                self.sessions.append(session)
+        return session
+
+    def retry_delay(self, attempt, response = None):
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** attempt)
+
+    def get(self, url, headers = None, stream = False):
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.wait(url)
+            response = None
+            try:
+                with tracer.span("http.get", url = url, attempt = attempt) as span:    # latency up to the response headers (with stream = True)
+                    response = self.thread_session().get(url, headers = headers, timeout = self.timeout, stream = stream)
+                    span.set(status = response.status_code)
+                    if tracer.enabled and not stream:
+                        span.set(bytes = len(response.content))
+                response.raise_for_status()    # 4xx/5xx (only 429 and 5xx are retried)
+                return response
+            except (self.requests.exceptions.ConnectionError, self.requests.exceptions.Timeout, self.requests.exceptions.HTTPError):
+                retryable = response is None or response.status_code in retry_status_codes
+                if not retryable or attempt == self.retries:
+                    raise
+                if response is not None:
+                    response.close()
+                time.sleep(self.retry_delay(attempt, response))
+
+    def fetch_all(self, urls, fetch = None):
+        """Fetch every URL concurrently and return the results in the order of `urls`.
+        `fetch(url)` defaults to returning the response text."""
+        if fetch is None:
+            fetch = lambda url: self.get(url).text
+        with ThreadPoolExecutor(max_workers = self.workers) as executor:
+            return list(executor.map(fetch, urls))    # map() keeps the input order
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_html.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Render the standings pages (.html) of generate_standings.py and
+    generate_best_standings.py straight to an output file.
+  - The page, row and cell templates are built once at import time with their
+    final indentation, and the rows are written in chunks, so the whole page is
+    never held in memory and no indent/dedent pass is needed.
+  - The output is the same as the former string-concatenation version,
+    including its markup (e.g. the "</font>" of the total score cell and the
+    unquoted href of the best standings), so that standings.css and links keep working.
+  - The cells of the contest page are computed in bulk from the score/elapsed
+    matrices (standings_matrix.py), which also give the task statistics
+    (solved participants, first accepted time) added to the header of the page.
+"""
+css_path = "../standings.css"
+rows_per_chunk = 1000
+task_url_format = "https://atcoder.jp/contests/{contest_id}/tasks/{contest_id}_{task_letter}"
+
+#----- page templates (the information items and the table header are inserted as they are) -----#
+page_head_template = (
+    '<!DOCTYPE html>\n'
+    '<html lang="ja">\n'
+    '  <head>\n'
+    '    <meta http-equiv="Content-Type" content="text/html; charset=utf-8">\n'
+    '    <link href="{css_path}" rel="stylesheet" type="text/css" media="all">\n'
+    '  </head>\n'
+    '  <body>\n'
+    '    <h1>{title}</h1>\n'
+    '    <h2>コンテスト情報</h2>\n'
+    '    <div>\n'
+    '      <ul>\n'
+    '{info_items}'
+    '      </ul>\n'
+    '{info_note}'
+    '    </div>\n'
+    '    <h2>ランキング表（所属：{affiliation}）</h2>\n'
+    '    <table class="stripe-table">\n'
+    '      <thead>\n'
+    '        <tr>\n'
+    '{header_cells}'
+    '        </tr>\n'
+    '      </thead>\n'
+    '      <tbody>\n'
+)
+page_tail = (
+    '      </tbody>\n'
+    '    </table>\n'
+    '  </body>\n'
+    '</html>'
+)
+info_item = '        <li>{}</li>\n'.format
+contest_page_note = '      ※詳細は<a href="{}" target="_blank" rel="noopener noreferrer">公式ページ</a>を参照のこと。\n'.format
+header_cell = '          <th>{}</th>\n'.format
+task_header_cell = '          <th><a href="{}" target="_blank" rel="noopener noreferrer">{}</a></th>\n'.format
+task_stats_header_cell = '          <th><a href="{}" target="_blank" rel="noopener noreferrer">{}</a><div class="task-stats">正解：{}名</div><div class="task-stats">最速：{}</div></th>\n'.format
+
+#----- row/cell templates -----#
+row_start = '        <tr>\n'
+row_end = '        </tr>\n'
+cell = '          <td>{}</td>\n'.format
+empty_cell = '          <td>-</td>\n'
+total_score_cell = '          <td><div class="total-score">{}</div><div class="time">{}</font></td>\n'.format
+score_cell = '          <td><div class="score">{}</div><div class="time">{}</div></td>\n'.format
+medal_cell = '          <td id="{}">{}</td>\n'.format
+best_score_cell = '          <td>{}<div class="contest_id">(<a href=https://atcoder.jp/contests/{} target="_blank" rel="noopener noreferrer">{}</a>)</td>\n'.format
+aggregate_cell = '          <td>{}<div class="aggregate-rank">{}位</div></td>\n'.format
+medal_ids = {1: "first", 2: "second", 3: "third"}
+
+def write_page(file, head, rows):
+    #----- write the head, then the rows (strings) in chunks, then the tail -----#
+    file.write(head)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= rows_per_chunk:
+            file.write("".join(chunk))
+            chunk.clear()
+    file.write("".join(chunk))
+    file.write(page_tail)
+
+#----- generate_standings.py ---------------------------------------------------------------------#
+def contest_head(contest_id, contest_info, affiliation, participants_number, tasks_number, css_path = css_path, task_stats = None):
+    #----- task_stats: TaskMatrix.task_stats() (standings_matrix.py), or None for no statistics -----#
+    header_cells = header_cell("順位") + header_cell("ユーザ") + header_cell("総得点")
+    for task_number in range(tasks_number):
+        task_letter = chr(task_number + 97)    # e.g. 0 -> a (url), A (header)
+        task_url = task_url_format.format(contest_id = contest_id, task_letter = task_letter)
+        if task_stats is None:
+            header_cells += task_header_cell(task_url, task_letter.upper())
+        else:
+            solved_number, first_elapsed = task_stats[task_number]
+            header_cells += task_stats_header_cell(task_url, task_letter.upper(), solved_number, first_elapsed if first_elapsed is not None else "-")
+    return page_head_template.format(
+        css_path = css_path,
+        title = contest_info["title"],
+        info_items = info_item(f'開催日時：{contest_info["start_time"]} - {contest_info["end_time"]}') + info_item(f"参加者総数：{participants_number}名"),
+        info_note = contest_page_note(f"https://atcoder.jp/contests/{contest_id}/"),
+        affiliation = affiliation,
+        header_cells = header_cells,
+    )
+
+def contest_rows(standings, matrix = None, rows = None):
+    #----- standings: ContestStandings (standings_model.py), matrix: its TaskMatrix; yield the rows (all if rows is None) -----#
+    from standings_matrix import TaskMatrix    # numpy (not needed by the best standings page)
+    if matrix is None:
+        matrix = TaskMatrix(standings)
+    if rows is None:
+        rows = range(len(standings))
+    for start in range(0, len(rows), rows_per_chunk):    # the display values are converted to lists block by block
+        block = rows[start:start + rows_per_chunk]
+        points, task_labels, solved, total_points, total_labels, total_solved = matrix.display_values(block)
+        for index, row in enumerate(block):
+            parts = [row_start, cell(standings.ranks[row]), cell(standings.username(row))]
+            parts.append(total_score_cell(total_points[index], total_labels[index]) if total_solved[index] else empty_cell)
+            for score, label, is_solved in zip(points[index], task_labels[index], solved[index]):
+                parts.append(score_cell(score, label) if is_solved else empty_cell)
+            parts.append(row_end)
+            yield "".join(parts)
+
+def write_contest_page(file, contest_id, contest_info, affiliation, participants_number, standings, css_path = css_path):
+    from standings_matrix import TaskMatrix
+    matrix = TaskMatrix(standings)
+    head = contest_head(contest_id, contest_info, affiliation, participants_number, standings.tasks_number, css_path, matrix.task_stats())
+    write_page(file, head, contest_rows(standings, matrix))
+
+#----- generate_best_standings.py ----------------------------------------------------------------#
+def best_head(title, contests_id, affiliation, users_number, aggregations = None):
+    #----- aggregations: see aggregation_engine.py (None: the best TotalScore only) -----#
+    contests_label = ", ".join(map(str, contests_id))
+    if aggregations is None:
+        score_cells = header_cell("総得点（最大値）")
+    else:
+        score_cells = "".join(header_cell(aggregation.label) for aggregation in aggregations)
+    return page_head_template.format(
+        css_path = css_path,
+        title = title,
+        info_items = info_item(f"対象コンテスト：{contests_label}") + info_item(f"参加者総数：{users_number}名"),
+        info_note = "",
+        affiliation = affiliation,
+        header_cells = header_cell("順位") + header_cell("ユーザ") + score_cells,
+    )
+
+def best_row(user, aggregations = None):
+    #----- user: {"UserName", "TotalScore", "ContestId", "Rank"} (and the fields of the aggregations) -----#
+    rank = user.get("Rank")
+    contest_id = user.get("ContestId")
+    if aggregations is None:
+        score_cells = best_score_cell(user.get("TotalScore"), contest_id, contest_id)
+    else:
+        score_cells = "".join(
+            best_score_cell(user.get("TotalScore"), contest_id, contest_id) if aggregation.key == "TotalScore"
+            else aggregate_cell(aggregation.display(user), user.get(f"{aggregation.key}Rank", rank))
+            for aggregation in aggregations)
+    return (row_start
+            + cell(rank)
+            + medal_cell(medal_ids.get(rank, ""), user.get("UserName"))
+            + score_cells
+            + row_end)
+
+def write_best_page(file, title, contests_id, affiliation, user_data, aggregations = None):
+    rows = map(best_row, user_data) if aggregations is None else (best_row(user, aggregations) for user in user_data)
+    write_page(file, best_head(title, contests_id, affiliation, len(user_data), aggregations), rows)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_matrix.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - The per-problem results of a ContestStandings (standings_model.py) as
+    (participants x tasks) NumPy matrices, built without copying the columns.
+  - The display values of every cell are computed in bulk:
+    - points (score / 100), as int(score * 1.0e-2)
+    - elapsed times in microseconds, formatted as str(datetime.timedelta(...))
+      once per distinct value
+    - the solved mask (a result with non-zero points and time; other cells are "-")
+  - The same matrices give the statistics of each task (number of participants
+    who solved it, first accepted time) for the header of the page.
+"""
+import datetime
+import numpy as np
+from standings_model import missing_score
+
+def elapsed_labels(microseconds):
+    #----- microseconds (array) -> "h:mm:ss" of each element (object array), formatted once per distinct value -----#
+    values, inverse = np.unique(microseconds, return_inverse = True)
+    labels = np.array([str(datetime.timedelta(microseconds = value)) for value in values.tolist()] or [""], dtype = object)
+    return labels[inverse.reshape(microseconds.shape)]
+
+class TaskMatrix:
+    def __init__(self, standings):
+        shape = (len(standings), standings.tasks_number)
+        self.scores = np.frombuffer(standings.task_scores, dtype = np.int64).reshape(shape)     # score * 100 (missing_score: no result)
+        self.elapsed = np.frombuffer(standings.task_elapsed, dtype = np.int64).reshape(shape)   # nanoseconds
+        self.points = np.trunc(self.scores * 1.0e-2).astype(np.int64)
+        self.microseconds = np.rint(self.elapsed * 1.0e-3).astype(np.int64)    # timedelta() rounds half to even as well
+        self.solved = (self.scores != missing_score) & (self.points != 0) & (self.microseconds != 0)
+
+        total_scores = np.frombuffer(standings.total_scores, dtype = np.int64)
+        total_elapsed = np.frombuffer(standings.total_elapsed, dtype = np.int64)
+        self.total_points = np.trunc(total_scores / 100).astype(np.int64)
+        self.total_microseconds = np.rint(total_elapsed * 1.0e-3).astype(np.int64)
+        self.total_solved = (self.total_points != 0) & (self.total_microseconds != 0)
+
+    def display_values(self, rows):
+        """Return the display values of `rows` (row numbers) as lists:
+        (points, "h:mm:ss", solved) of the tasks, then (points, "h:mm:ss", solved) of the totals."""
+        rows = np.asarray(rows, dtype = np.intp)
+        return (self.points[rows].tolist(), elapsed_labels(self.microseconds[rows]).tolist(), self.solved[rows].tolist(),
+                self.total_points[rows].tolist(), elapsed_labels(self.total_microseconds[rows]).tolist(), self.total_solved[rows].tolist())
+
+    def task_stats(self):
+        """Return [(number of participants who solved the task, first accepted time or None)] of each task."""
+        solved_numbers = self.solved.sum(axis = 0).tolist()
+        first_microseconds = np.where(self.solved, self.microseconds, np.iinfo(np.int64).max).min(axis = 0, initial = np.iinfo(np.int64).max).tolist()
+        return [(solved_number, datetime.timedelta(microseconds = first) if solved_number else None)
+                for solved_number, first in zip(solved_numbers, first_microseconds)]
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_model.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Compact in-memory model of the participants of a contest.
+    Instead of one nested dict per participant, the values are kept in
+    typed arrays (one column per field), and the per-problem results in
+    two flat arrays indexed by (row, task) where the task columns are
+    built once from "TaskInfo".
+  - Usernames are interned in a UsernameTable that can be shared by
+    several contests, so each row only holds an integer user ID.
+  - Scores and elapsed times are kept in AtCoder's units (score * 100, nanoseconds).
+"""
+import sys
+import threading
+from array import array
+
+missing_score = -1    # the participant has no result for the task
+
+class UsernameTable:
+    """Interned usernames <-> integer user IDs (can be shared by worker threads)."""
+    __slots__ = ("ids", "names", "lock")
+
+    def __init__(self):
+        self.ids = {}      # UserName -> user ID
+        self.names = []    # user ID -> UserName
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, user_id):
+        return self.names[user_id]
+
+    def intern(self, username):
+        user_id = self.ids.get(username)
+        if user_id is None:
+            with self.lock:
+                user_id = self.ids.get(username)
+                if user_id is None:
+                    user_id = len(self.names)
+                    username = sys.intern(username)
+                    self.names.append(username)
+                    self.ids[username] = user_id
+        return user_id
+
+class ContestStandings:
+    """Columnar standings of one contest (all participants or the filtered ones)."""
+    __slots__ = ("contest_id", "task_names", "task_index", "usernames", "user_ids", "ranks",
+                 "total_scores", "total_elapsed", "solved_numbers", "task_scores", "task_elapsed")
+
+    def __init__(self, contest_id, task_info, usernames = None):
+        self.contest_id = contest_id
+        self.task_names = [task["TaskScreenName"] for task in task_info]    # e.g. ["abc123_a", "abc123_b", ...]
+        self.task_index = {task_name: task_number for task_number, task_name in enumerate(self.task_names)}
+        self.usernames = usernames if usernames is not None else UsernameTable()
+        self.user_ids = array("i")
+        self.ranks = array("i")
+        self.total_scores = array("q")
+        self.total_elapsed = array("q")
+        self.solved_numbers = array("i")    # tasks with a positive score (counted even if task_info is empty)
+        self.task_scores = array("q")     # [row * tasks_number + task]
+        self.task_elapsed = array("q")    # [row * tasks_number + task]
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    @property
+    def tasks_number(self):
+        return len(self.task_names)
+
+    def append(self, participant):
+        #----- participant: one entry of "StandingsData" -----#
+        self.user_ids.append(self.usernames.intern(participant["UserName"]))
+        self.ranks.append(participant["Rank"])
+        total_result = participant["TotalResult"]
+        self.total_scores.append(int(total_result["Score"]))
+        self.total_elapsed.append(total_result["Elapsed"])
+
+        scores = [missing_score] * self.tasks_number
+        elapsed = [0] * self.tasks_number
+        solved_number = 0
+        for task_name, task_result in participant["TaskResults"].items():
+            if task_result["Score"] > 0:
+                solved_number += 1
+            task_number = self.task_index.get(task_name)
+            if task_number is not None:
+                scores[task_number] = int(task_result["Score"])
+                elapsed[task_number] = task_result["Elapsed"]
+        self.solved_numbers.append(solved_number)
+        self.task_scores.extend(scores)
+        self.task_elapsed.extend(elapsed)
+
+    def extend(self, participants):
+        for participant in participants:
+            self.append(participant)
+
+    def username(self, row):
+        return self.usernames[self.user_ids[row]]
+
+    def task_result(self, row, task_number):
+        """Return (score, elapsed) of the task, or None if the participant has no result."""
+        position = row * self.tasks_number + task_number
+        score = self.task_scores[position]
+        if score == missing_score:
+            return None
+        return score, self.task_elapsed[position]
+
+    def userinfo(self):
+        """Return the rows as [{"UserName", "TotalScore", "ContestId"}] (TotalScore in points)."""
+        return [{"UserName": self.username(row), "TotalScore": int(self.total_scores[row] / 100), "ContestId": self.contest_id} for row in range(len(self))]
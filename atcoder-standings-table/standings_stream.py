@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_stream.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Incremental parser of the standings data (.json) of an AtCoder contest.
+    The body is fed in chunks (e.g. response.iter_content()) and the entries
+    of "StandingsData" are yielded one at a time as soon as they are complete,
+    so the whole participant list is never held in memory.
+  - The other top-level keys ("TaskInfo", "Fixed", ...) are parsed as a whole.
+    Iterate stream["StandingsData"] first, then read the other keys (once another
+    key has been read, the participants are skipped and stream["StandingsData"] raises RuntimeError):
+      stream = StandingsStream(chunks)
+      for participant in stream["StandingsData"]:
+          ...
+      problems_data = stream["TaskInfo"]
+  - If `raw_file` is given, the raw body is written to it as it is read (no pretty-printing).
+"""
+import codecs
+import json
+import re
+import time
+from standings_trace import tracer
+
+whitespace = re.compile(r"[ \t\n\r]*")
+value_terminators = " \t\n\r,:]}"    # characters that can follow a complete value
+streamed_key = "StandingsData"
+
+class StandingsStream:
+    def __init__(self, chunks, raw_file = None):
+        self.chunks = iter(chunks)
+        self.raw_file = raw_file
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.raw_decode = self.traced_raw_decode if tracer.enabled else self.json_decoder.raw_decode
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.header = {}    # top-level keys other than "StandingsData"
+        self.state = "start"    # "start" -> "keys" <-> "participants" -> "end"
+        self.after_participant = False
+        self.participants_started = False    # the "[" of "StandingsData" has been read
+
+    #----- buffer handling ------------------------------------------------------------------#
+    def read_more(self):
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.buffer = self.buffer[self.position:] + self.decoder.decode(b"", final = True)
+            self.position = 0
+            self.eof = True
+            return False
+        if self.raw_file is not None:
+            self.raw_file.write(chunk)
+        self.buffer = self.buffer[self.position:] + self.decoder.decode(chunk)    # drop the consumed part
+        self.position = 0
+        return True
+
+    def peek(self):
+        #----- skip whitespaces and return the next character ("" at the end of the body) -----#
+        while True:
+            self.position = whitespace.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position + 1]
+            self.read_more()
+
+    def expect(self, characters):
+        character = self.peek()
+        if character == "" or character not in characters:
+            raise ValueError(f"Invalid standings json: expected {characters!r} but got {character!r} (offset {self.position}).")
+        self.position += 1
+        return character
+
+    def decode_value(self):
+        #----- decode one complete json value (a number at the end of the buffer may be truncated, e.g. "1." of "1.5") -----#
+        self.peek()
+        while True:
+            try:
+                value, end = self.raw_decode(self.buffer, self.position)
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in value_terminators):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.read_more()
+
+    def traced_raw_decode(self, buffer, position):
+        #----- json decoding only, without waiting for the chunks (accumulated as "json.decode") -----#
+        start = time.perf_counter_ns()
+        try:
+            return self.json_decoder.raw_decode(buffer, position)
+        finally:
+            tracer.accumulate("json.decode", time.perf_counter_ns() - start)
+
+    #----- top-level object -----------------------------------------------------------------#
+    def advance_to_participants(self):
+        #----- parse the top-level keys up to the "[" of "StandingsData" (False if it does not exist) -----#
+        while self.state != "end":
+            if self.state == "start":
+                self.expect("{")
+                self.state = "keys"
+                if self.peek() == "}":
+                    self.position += 1
+                    self.state = "end"
+            elif self.state == "keys":
+                key = self.decode_value()
+                self.expect(":")
+                if key == streamed_key:
+                    self.expect("[")
+                    self.state = "participants"
+                    self.after_participant = False
+                    self.participants_started = True
+                else:
+                    self.header[key] = self.decode_value()
+                    self.end_value()
+            else:
+                return True
+        return False
+
+    def end_value(self):
+        if self.expect(",}") == "}":
+            self.state = "end"
+        else:
+            self.state = "keys"
+
+    def participants(self):
+        if not self.advance_to_participants():
+            return
+        while self.state == "participants":
+            if self.after_participant:
+                self.after_participant = False
+                if self.expect(",]") == "]":
+                    self.end_value()
+                    return
+            elif self.peek() == "]":    # empty list
+                self.position += 1
+                self.end_value()
+                return
+            participant = self.decode_value()
+            self.after_participant = True
+            yield participant
+
+    def parse_to_end(self):
+        for _ in self.participants():    # skip the entries which have not been read
+            pass
+        while self.advance_to_participants():
+            for _ in self.participants():
+                pass
+        while not self.eof and self.read_more():    # read the rest of the body (e.g. a trailing newline)
+            pass
+
+    def __getitem__(self, key):
+        if key == streamed_key:
+            if self.participants_started and self.state != "participants":    # skipped by reading another key first, or already read
+                raise RuntimeError(f'"{streamed_key}" has already been consumed; iterate it before reading the other keys.')
+            return self.participants()
+        self.parse_to_end()
+        return self.header[key]
+
+    def get(self, key, default = None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
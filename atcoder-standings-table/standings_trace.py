@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_trace.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Stage-level tracing of generate_standings.py and generate_best_standings.py
+    (--profile_out). The stages are wrapped in spans:
+      with tracer.span("render", contest_id = contest_id) as span:
+          ...
+          span.set(rows = rows_number)
+  - While tracing is disabled (the default), tracer.span() returns a shared no-op
+    object, so an instrumented stage costs one attribute lookup and one call.
+  - Fine-grained work (e.g. json decoding of each participant) is accumulated into
+    totals instead of one span per call.
+  - Output (by the extension of the file):
+    - .jsonl: one span per line ({"name", "start_ms", "duration_ms", "thread", "args"}) and the totals
+    - otherwise: Chrome trace format (chrome://tracing, https://ui.perfetto.dev)
+    A summary table (count, total, mean, max, bytes) is printed at the end.
+"""
+import json
+import os
+import threading
+import time
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args):
+        pass
+
+null_span = NullSpan()
+
+class Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.events = []    # (name, start ns, end ns, thread id, args)
+        self.totals = {}    # name -> {"count", "ns"}
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter_ns()
+
+    def enable(self):
+        self.enabled = True
+        self.origin = time.perf_counter_ns()
+
+    def span(self, name, **args):
+        return Span(self, name, args) if self.enabled else null_span
+
+    def add(self, name, start_ns, end_ns, args = None):
+        self.events.append((name, start_ns, end_ns, threading.get_ident(), args or {}))    # list.append is atomic
+
+    def accumulate(self, name, duration_ns, count = 1):
+        with self.lock:
+            total = self.totals.setdefault(name, {"count": 0, "ns": 0})
+            total["count"] += count
+            total["ns"] += duration_ns
+
+    def summary(self):
+        """Return [(name, count, total s, mean ms, max ms, bytes)] in the order of the first occurrence."""
+        rows = {}
+        for name, start_ns, end_ns, _, args in self.events:
+            row = rows.setdefault(name, [0, 0, 0, 0])    # count, total ns, max ns, bytes
+            row[0] += 1
+            row[1] += end_ns - start_ns
+            row[2] = max(row[2], end_ns - start_ns)
+            row[3] += args.get("bytes", 0)
+        summary = [(name, count, total_ns * 1e-9, total_ns * 1e-6 / count, max_ns * 1e-6, bytes_number) for name, (count, total_ns, max_ns, bytes_number) in rows.items()]
+        summary += [(f"{name} (total)", total["count"], total["ns"] * 1e-9, total["ns"] * 1e-6 / max(1, total["count"]), None, 0) for name, total in self.totals.items()]
+        return summary
+
+    def print_summary(self):
+        print(f"  {'span':<24} {'count':>7} {'total [s]':>10} {'mean [ms]':>10} {'max [ms]':>10} {'bytes':>12}")
+        for name, count, total_seconds, mean_ms, max_ms, bytes_number in self.summary():
+            max_label = f"{max_ms:.1f}" if max_ms is not None else "-"
+            bytes_label = str(bytes_number) if bytes_number else "-"
+            print(f"  {name:<24} {count:>7} {total_seconds:>10.3f} {mean_ms:>10.2f} {max_label:>10} {bytes_label:>12}")
+
+    def write(self, filepath):
+        threads = {}    # thread id -> small number
+        if filepath.endswith(".jsonl"):
+            with open(filepath, "w") as file:
+                for name, start_ns, end_ns, thread, args in sorted(self.events, key = lambda event: event[1]):
+                    record = {"name": name, "start_ms": round((start_ns - self.origin) * 1e-6, 3), "duration_ms": round((end_ns - start_ns) * 1e-6, 3), "thread": threads.setdefault(thread, len(threads)), "args": args}
+                    file.write(json.dumps(record, ensure_ascii = False, default = str) + "\n")
+                for name, total in self.totals.items():
+                    file.write(json.dumps({"name": name, "total_ms": round(total["ns"] * 1e-6, 3), "count": total["count"]}) + "\n")
+            return
+        trace_events = [
+          {"name": name, "ph": "X", "ts": (start_ns - self.origin) / 1000, "dur": (end_ns - start_ns) / 1000, "pid": os.getpid(), "tid": threads.setdefault(thread, len(threads)), "args": args}
+          for name, start_ns, end_ns, thread, args in self.events
+        ]
+        totals = {name: {"count": total["count"], "total_ms": round(total["ns"] * 1e-6, 3)} for name, total in self.totals.items()}
+        with open(filepath, "w") as file:
+            json.dump({"traceEvents": trace_events, "otherData": {"totals": totals}}, fp = file, ensure_ascii = False, default = str)
+
+tracer = Tracer()
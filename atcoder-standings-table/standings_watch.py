@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+- Module: standings_watch.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Watch mode of generate_standings.py (live standings during a running contest).
+    "/standings/json" is polled on an interval with conditional requests
+    (If-None-Match/If-Modified-Since), so an unchanged body costs a 304 only.
+  - The participants of the affiliation are compared with the previous snapshot
+    by UserName (Rank, TotalResult and TaskResults); only the new or changed rows
+    are rendered again, the other rows are reused as they are.
+  - The html (and the .json files) are written to a temporary file and swapped
+    with os.replace(), so a browser never sees a half-written page.
+  - The poll and render latency of each cycle is printed (and appended to a
+    JSON Lines file if `log_filepath` is given).
+  - The watch stops when the standings are fixed ("Fixed": true) or after `cycles` cycles.
+  - The responses are not stored in the cache (./json/cache) because they change on every poll.
+"""
+import json
+import os
+import standings_html
+import time
+from filtered_output import save_filtered
+from standings_matrix import TaskMatrix
+from standings_model import ContestStandings
+from standings_stream import StandingsStream
+
+class StandingsWatcher:
+    def __init__(self, contest_id, affiliation, contest_info, standings_url, fetcher, html_filepath, json_filepath = None,
+                 filtered_filepath = None, filtered_format = "json", compact = False, css_path = standings_html.css_path,
+                 log_filepath = None, record_dir = None):
+        self.contest_id = contest_id
+        self.affiliation = affiliation
+        self.contest_info = contest_info
+        self.standings_url = standings_url
+        self.fetcher = fetcher
+        self.html_filepath = html_filepath
+        self.json_filepath = json_filepath
+        self.filtered_filepath = filtered_filepath
+        self.filtered_format = filtered_format
+        self.compact = compact
+        self.css_path = css_path
+        self.log_filepath = log_filepath
+        self.record_dir = record_dir
+        self.etag = None
+        self.last_modified = None
+        self.task_names = None
+        self.rows = {}    # UserName -> (Rank, TotalResult, TaskResults), rendered row
+        self.head = None
+        self.cycle = 0
+        self.fixed = False
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def poll(self):
+        """Return (participants of the affiliation, participants number, "TaskInfo"),
+        or None if the standings have not been modified since the last poll."""
+        temp_path = f"{self.json_filepath}.tmp" if self.json_filepath is not None else None
+        with self.fetcher.get(self.standings_url, headers = self.conditional_headers(), stream = True) as response:
+            if response.status_code == 304:
+                return None
+            raw_file = open(temp_path, "wb") if temp_path is not None else None
+            try:
+                stream = StandingsStream(response.iter_content(64 * 1024), raw_file = raw_file)
+                participants_number = 0
+                standings_data = []
+                for participant in stream["StandingsData"]:
+                    participants_number += 1
+                    if participant["Affiliation"] == self.affiliation:
+                        standings_data.append(participant)
+                problems_data = stream["TaskInfo"]
+                self.fixed = stream.get("Fixed") is True
+            finally:
+                if raw_file is not None:
+                    raw_file.close()
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+        if temp_path is not None:
+            if self.record_dir is not None:
+                with open(temp_path, "rb") as source, open(os.path.join(self.record_dir, f"{self.cycle:04d}.json"), "wb") as record:
+                    record.write(source.read())
+            os.replace(temp_path, self.json_filepath)
+        return standings_data, participants_number, problems_data
+
+    def render(self, standings_data, participants_number, problems_data):
+        """Render the new or changed rows only and swap the html file. Return (changed, removed)."""
+        task_names = [task["TaskScreenName"] for task in problems_data]
+        if task_names != self.task_names:    # the task columns changed: render every row again
+            self.task_names = task_names
+            self.rows = {}
+        standings = ContestStandings(self.contest_id, problems_data)
+        standings.extend(standings_data)
+        matrix = TaskMatrix(standings)    # the task statistics of the head need every row
+        head = standings_html.contest_head(self.contest_id, self.contest_info, self.affiliation, participants_number, len(task_names), self.css_path, matrix.task_stats())
+
+        #----- diff against the previous snapshot by UserName -----#
+        changed_rows = []
+        keys = []
+        for row, participant in enumerate(standings_data):
+            key = (participant["Rank"], participant["TotalResult"], participant["TaskResults"])
+            keys.append(key)
+            previous = self.rows.get(participant["UserName"])
+            if previous is None or previous[0] != key:
+                changed_rows.append(row)
+        usernames = [participant["UserName"] for participant in standings_data]
+        removed = len(set(self.rows) - set(usernames))
+        if not changed_rows and not removed and head == self.head:
+            return 0, 0
+
+        for row, rendered_row in zip(changed_rows, standings_html.contest_rows(standings, matrix, changed_rows)):
+            self.rows[usernames[row]] = (keys[row], rendered_row)
+        self.rows = {username: self.rows[username] for username in usernames}    # order of the new snapshot
+        self.head = head
+
+        #----- write to a temporary file, then swap -----#
+        temp_path = f"{self.html_filepath}.tmp"
+        with open(temp_path, "w") as file:
+            standings_html.write_page(file, head, (rendered_row for _, rendered_row in self.rows.values()))
+        os.replace(temp_path, self.html_filepath)
+        if self.filtered_filepath is not None:
+            save_filtered(f"{self.filtered_filepath}.tmp", standings_data, self.filtered_format, self.compact)
+            os.replace(f"{self.filtered_filepath}.tmp", self.filtered_filepath)
+        return len(changed_rows), removed
+
+    def run_cycle(self):
+        self.cycle += 1
+        start_time = time.perf_counter()
+        snapshot = self.poll()
+        poll_seconds = time.perf_counter() - start_time
+        changed = removed = 0
+        if snapshot is not None:
+            changed, removed = self.render(*snapshot)
+        render_seconds = time.perf_counter() - start_time - poll_seconds
+        record = {
+          "cycle": self.cycle,
+          "time": time.time(),
+          "modified": snapshot is not None,
+          "poll_seconds": round(poll_seconds, 6),
+          "render_seconds": round(render_seconds, 6),
+          "rows": len(self.rows),
+          "changed": changed,
+          "removed": removed,
+        }
+        print(f"  [{self.cycle}] {'modified' if snapshot is not None else 'not modified'}, "
+              f"poll {poll_seconds:.3f} s, render {render_seconds:.3f} s, {changed} changed / {removed} removed / {len(self.rows)} rows")
+        if self.log_filepath is not None:
+            with open(self.log_filepath, "a") as file:
+                file.write(json.dumps(record) + "\n")
+        return record
+
+    def run(self, interval, cycles = 0):
+        """Poll every `interval` seconds until the standings are fixed (or `cycles` cycles, if > 0)."""
+        while True:
+            start_time = time.monotonic()
+            self.run_cycle()
+            if self.fixed or (cycles > 0 and self.cycle >= cycles):
+                return
+            time.sleep(max(0.0, interval - (time.monotonic() - start_time)))
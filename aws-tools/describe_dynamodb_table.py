@@ -2,18 +2,49 @@
 """
 - Script Name: describe_dynamodb_table.py
 - Author: @k0j1r0n0
-- Date: March 30, 2023
+- Date: March 30, 2023 (last updated: October 18, 2026)
 - Description
   - This script is to get the configuration of a DynamoDB table using AWS SDK for Python (Boto3)
     and save the result as a JSON file.
     Make sure that you can use Python3 on your CLI.
+  - With --all, every table of the account (list_tables, page by page) is described
+    on a bounded thread pool sharing one session and one client, and the results are
+    saved as one file per table plus an index:
+    - ./results/dynamodb_tables/{table}.json
+    - ./results/dynamodb_tables/index.json
+  - Throttled requests are retried by botocore in "adaptive" retry mode
+    (exponential backoff plus client-side rate limiting).
+  - With --profiles/--regions, the tables of every (profile, region) pair are described
+    in parallel with one session per profile and one client per pair. Each result is
+    written as a line of JSON Lines as soon as it finishes, followed by a summary line
+    with the wall-clock time of each pair:
+    - ./results/dynamodb_fanout.jsonl
+  - With --snapshot, the descriptions (and the TTL settings) are kept in a snapshot store
+    instead (see dynamodb_snapshot_store.py): unchanged tables are not written again, and
+    the changes since the last run are printed and logged as a structured diff.
+  - With --scan_stats, the items of --table are read by a parallel Scan under an RCU budget
+    and their statistics (count, size histogram, attribute presence, partition key
+    cardinality) are saved (see dynamodb_scan_stats.py):
+    - ./results/dynamodb_scan_stats.json
+  - --endpoint_url points the client to a local stand-in (e.g. DynamoDB Local).
 """
 import argparse
 import boto3
 import json
-from datetime import date, datetime
+import os
+import queue
+import time
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from dynamodb_scan_stats import scan_table_statistics
+from dynamodb_snapshot_store import SnapshotStore, snapshot_dir_path
 
 result_file_path = "./results/dynamodb_config.json"
+result_dir_path = "./results/dynamodb_tables"
+fanout_file_path = "./results/dynamodb_fanout.jsonl"
+scan_stats_file_path = "./results/dynamodb_scan_stats.json"
 
 def parse_dynamodb_parameters():
     parser = argparse.ArgumentParser(
@@ -22,13 +53,34 @@ def parse_dynamodb_parameters():
                  epilog = "end",
                  add_help = True,
              )
-    parser.add_argument("--table", type = str, required = True, help = "DynamoDB table name (type: str)")
-    parser.add_argument("--profile", type = str, required = True, help = "AWS named profile that is a collection of settings and credentials (type: str)")
+    parser.add_argument("--table", type = str, help = "DynamoDB table name (type: str)")
+    parser.add_argument("--all", action = "store_true", help = "describe all the tables of the account instead of --table")
+    parser.add_argument("--profile", type = str, help = "AWS named profile that is a collection of settings and credentials (type: str)")
+    parser.add_argument("--profiles", type = str, nargs = "+", help = "AWS named profiles to fan out over (type: str, ...)")
+    parser.add_argument("--regions", type = str, nargs = "+", help = "regions to fan out over with --profiles (default: the region of each profile) (type: str, ...)")
+    parser.add_argument("--workers", type = int, default = 8, help = "number of concurrent describe_table calls with --all (type: int)")
+    parser.add_argument("--max_attempts", type = int, default = 10, help = "max attempts of a throttled request (type: int)")
+    parser.add_argument("--output_dir", type = str, default = result_dir_path, help = "directory of the result files with --all (type: str)")
+    parser.add_argument("--output_jsonl", type = str, default = fanout_file_path, help = "result file (JSON Lines) with --profiles (type: str)")
+    parser.add_argument("--snapshot", type = str, nargs = "?", const = snapshot_dir_path, help = f"keep the descriptions in a snapshot store and show the changes (default: {snapshot_dir_path}) (type: str)")
+    parser.add_argument("--scan_stats", action = "store_true", help = "scan --table and save the item statistics")
+    parser.add_argument("--segments", type = int, default = 8, help = "number of parallel scan segments with --scan_stats (type: int)")
+    parser.add_argument("--rcu", type = float, default = 100.0, help = "read capacity units per second for --scan_stats, 0: no limit (type: float)")
+    parser.add_argument("--max_items", type = int, default = 0, help = "stop --scan_stats after about this number of items, 0: whole table (type: int)")
+    parser.add_argument("--endpoint_url", type = str, help = "endpoint of a local stand-in such as DynamoDB Local (type: str)")
     args = parser.parse_args()
-    table = args.table
-    profile = args.profile
+    if args.profiles is not None:
+        if args.profile is not None or args.table is not None or args.all:
+            parser.error("--profiles cannot be used with --profile, --table or --all")
+        return args
+    if args.profile is None:
+        parser.error("--profile (or --profiles) is required")
+    if args.table is None and not args.all:
+        parser.error("either --table or --all is required")
+    if args.scan_stats and (args.table is None or args.all or args.snapshot is not None):
+        parser.error("--scan_stats needs --table (and cannot be used with --all or --snapshot)")
 
-    return table, profile
+    return args
 
 def json_serial(object):
     #---- transform datetime/date -> isoformat ------------------------#
@@ -36,25 +88,253 @@ def json_serial(object):
         return object.isoformat()
     raise TypeError (f"Object of type {object} is not serializable.")
 
-if __name__ == "__main__":
-    table, profile = parse_dynamodb_parameters()
-    print("[Target DynamoDB Table]")
-    print(f"  - {table} (profile: {profile})")
-    print("------------------------------------------------------------")
-    
-    session = boto3.Session(profile_name = profile)
-    dynamodb = session.client("dynamodb")
-    
-    #---- get DynamoDB table configuration -------------------------------------------------------#
-    print("Loading the DynamoDB table...")
-    response = dynamodb.describe_table(TableName = table)    # type: dict
-    #item_number = response.get("Table").get("ItemCount")
-    #print(f"ItemCount: {item_number}")
-    
-    #---- save a result file (.json) -------------------------------------------------------------#
-    with open(result_file_path, "w") as file:
+def create_dynamodb_client(session, workers = 1, max_attempts = 10, endpoint_url = None, region = None):
+    #---- one client shared by the worker threads (boto3 clients are thread-safe, sessions are not) ----#
+    config = Config(
+                 region_name = region,
+                 max_pool_connections = max(10, workers),
+                 retries = {"mode": "adaptive", "max_attempts": max_attempts},    # backoff + client-side rate limiting on throttling
+             )
+    return session.client("dynamodb", config = config, endpoint_url = endpoint_url)
+
+def list_table_names(dynamodb):
+    #---- page through list_tables (100 tables per page) -------------#
+    for page in dynamodb.get_paginator("list_tables").paginate():
+        yield from page.get("TableNames", [])
+
+def save_result(file_path, response):
+    with open(file_path, "w") as file:
         json.dump(response, indent = 4, fp = file, default = json_serial, ensure_ascii = False)
+
+def describe_table(dynamodb, table, time_to_live = False):
+    #---- return (response, None) or (None, error message) ---------#
+    try:
+        response = dynamodb.describe_table(TableName = table)
+        if time_to_live:    # TTL is not a part of describe_table
+            response["Table"]["TimeToLiveDescription"] = dynamodb.describe_time_to_live(TableName = table)["TimeToLiveDescription"]
+        return response, None
+    except (BotoCoreError, ClientError) as e:
+        return None, str(e)
+
+def describe_and_record(dynamodb, table, store, profile):
+    #---- describe one table (with TTL) and record it in the snapshot store ----#
+    response, error = describe_table(dynamodb, table, time_to_live = True)
+    if error is not None:
+        return {"TableName": table, "Status": "error", "Error": error}
+    status, changes = store.record(profile, dynamodb.meta.region_name, table, response["Table"])
+    return {"TableName": table, "Status": "ok", "Snapshot": status, "Changes": changes}
+
+def describe_and_save(dynamodb, table, output_dir):
+    #---- describe one table and save it; errors are recorded in the index instead of stopping the run ----#
+    file_path = os.path.join(output_dir, f"{table}.json")
+    response, error = describe_table(dynamodb, table)
+    if error is not None:
+        return {"TableName": table, "Status": "error", "Error": error}
+    save_result(file_path, response)
+    return {"TableName": table, "Status": "ok", "File": os.path.basename(file_path), "TableStatus": response["Table"].get("TableStatus")}
+
+def describe_all_tables(dynamodb, output_dir, workers = 8, store = None, profile = None):
+    """Describe every table concurrently while list_tables is paged, and return the index entries
+    in the order of list_tables. With `store`, the tables are recorded in the snapshot store instead."""
+    if store is None:
+        os.makedirs(output_dir, exist_ok = True)
+    with ThreadPoolExecutor(max_workers = workers) as executor:
+        if store is None:
+            futures = [executor.submit(describe_and_save, dynamodb, table, output_dir) for table in list_table_names(dynamodb)]
+        else:
+            futures = [executor.submit(describe_and_record, dynamodb, table, store, profile) for table in list_table_names(dynamodb)]
+        return [future.result() for future in futures]
+
+def create_fanout_clients(profiles, regions = None, workers = 1, max_attempts = 10, endpoint_url = None):
+    #---- one session per profile and one client per (profile, region), created in the main thread ----#
+    clients = {}
+    for profile in profiles:
+        session = boto3.Session(profile_name = profile)
+        for region in regions or [session.region_name]:
+            clients[(profile, region)] = create_dynamodb_client(session, workers, max_attempts, endpoint_url, region)
+    return clients
+
+def fan_out(clients, file, workers = 16, store = None):
+    """Describe the tables of every (profile, region) pair on one thread pool and write each result
+    to `file` (JSON Lines) as soon as it finishes. Return the summary of each pair.
+    With `store`, the tables are recorded in the snapshot store and the lines have the changes instead of the description."""
+    results = queue.Queue()    # filled by the worker threads, written by the calling thread only
+    start_times = {pair: time.perf_counter() for pair in clients}
+
+    def describe_and_put(pair, table):
+        try:
+            response, error = describe_table(clients[pair], table, time_to_live = store is not None)
+            if store is not None and error is None:
+                response = store.record(*pair, table, response["Table"])    # (status, changes)
+        except Exception as e:    # always answer, or the writer would wait forever
+            response, error = None, repr(e)
+        results.put(("table", pair, table, response, error))
+
+    def list_and_submit(pair):
+        tables, error, removed = [], None, []
+        try:
+            for table in list_table_names(clients[pair]):
+                executor.submit(describe_and_put, pair, table)
+                tables.append(table)
+            if store is not None:
+                removed = store.remove_missing(*pair, tables)
+        except Exception as e:
+            error = str(e)
+        results.put(("listed", pair, len(tables), error, removed))
+
+    summaries = {pair: {"Type": "summary", "Profile": pair[0], "Region": pair[1], "Tables": None, "Errors": 0, "Seconds": None} for pair in clients}
+    described = dict.fromkeys(clients, 0)
+    pending = set(clients)
+    with ThreadPoolExecutor(max_workers = workers) as executor:
+        for pair in clients:
+            executor.submit(list_and_submit, pair)
+        while pending:
+            kind, pair, *result = results.get()
+            summary = summaries[pair]
+            if kind == "listed":
+                summary["Tables"], error, removed = result
+                if error is not None:
+                    summary["ListError"] = error
+                if store is not None:
+                    summary["Removed"] = removed
+            else:
+                table, response, error = result
+                described[pair] += 1
+                line = {"Type": "table", "Profile": pair[0], "Region": pair[1], "TableName": table}
+                if error is not None:
+                    summary["Errors"] += 1
+                    line.update(Status = "error", Error = error)
+                elif store is not None:
+                    line.update(Status = "ok", Snapshot = response[0], Changes = response[1])
+                else:
+                    line.update(Status = "ok", Table = response["Table"])
+                file.write(json.dumps(line, default = json_serial, ensure_ascii = False) + "\n")
+                file.flush()
+            if summary["Tables"] is not None and described[pair] == summary["Tables"]:    # the last table of the pair
+                summary["Seconds"] = round(time.perf_counter() - start_times[pair], 3)
+                file.write(json.dumps(summary, ensure_ascii = False) + "\n")
+                file.flush()
+                pending.discard(pair)
+    return list(summaries.values())
+
+def print_snapshot_changes(tables, removed = ()):
+    #---- tables: [{"TableName", "Snapshot", "Changes"}] --------------#
+    statuses = [table.get("Snapshot") for table in tables]
+    print("[Snapshot]")
+    print(f"  - {statuses.count('unchanged')} unchanged, {statuses.count('new')} new, {statuses.count('changed')} changed, {len(removed)} removed")
+    for table in tables:
+        if table.get("Snapshot") in ("new", "changed"):
+            print(f"  * {table['TableName']} ({table['Snapshot']})")
+            for change in table["Changes"]:
+                print(f"      {change['Path']}: {json.dumps(change['Old'], ensure_ascii = False)} -> {json.dumps(change['New'], ensure_ascii = False)}")
+    for table in removed:
+        print(f"  * {table} (removed)")
+
+if __name__ == "__main__":
+    args = parse_dynamodb_parameters()
+    if args.profiles is not None:
+        print("[Target DynamoDB Tables]")
+        clients = create_fanout_clients(args.profiles, args.regions, args.workers, args.max_attempts, args.endpoint_url)
+        for profile, region in clients:
+            print(f"  - (all tables) (profile: {profile}, region: {region})")
+    else:
+        print("[Target DynamoDB Table]")
+        print(f"  - {'(all tables)' if args.all else args.table} (profile: {args.profile})")
+        session = boto3.Session(profile_name = args.profile)
+        workers = args.segments if args.scan_stats else args.workers if args.all else 1
+        dynamodb = create_dynamodb_client(session, workers, args.max_attempts, args.endpoint_url)
+    store = SnapshotStore(args.snapshot) if args.snapshot is not None else None
     print("------------------------------------------------------------")
-    print("[Output File]")
-    print(f"  - {result_file_path}")
-    print("Done.")
\ No newline at end of file
+
+    if args.profiles is not None:
+        #---- fan out over (profile, region) pairs and stream the results (.jsonl) ---------------#
+        print("Loading the DynamoDB tables...")
+        with open(args.output_jsonl, "w") as file:
+            summaries = fan_out(clients, file, args.workers, store)
+        print("------------------------------------------------------------")
+        print("[Wall-clock Time]")
+        for summary in summaries:
+            list_error = f" (list_tables: {summary['ListError']})" if "ListError" in summary else ""
+            print(f"  - {summary['Profile']} / {summary['Region']}: {summary['Seconds']} s, {summary['Tables']} table(s), {summary['Errors']} error(s){list_error}")
+        print("[Output File]")
+        print(f"  - {args.output_jsonl}")
+        if store is not None:
+            store.save()
+            print(f"  - {store.index_path}")
+            print(f"  - {store.changes_path}")
+        print("Done.")
+    elif args.scan_stats:
+        #---- parallel scan and streaming statistics ---------------------------------------------#
+        print(f"Scanning the DynamoDB table ({args.segments} segments, {args.rcu} RCU/s)...")
+        start_time = time.perf_counter()
+        stats = scan_table_statistics(dynamodb, args.table, args.segments, args.rcu, args.max_items)
+        summary = {"TableName": args.table, "Seconds": round(time.perf_counter() - start_time, 3), **stats.summary()}
+        save_result(scan_stats_file_path, summary)
+        print("------------------------------------------------------------")
+        print("[Item Statistics]")
+        print(f"  - items: {summary['ItemCount']} (average {summary['AverageItemBytes']} B, max {summary['MaxItemBytes']} B)")
+        print(f"  - partition key ({summary['PartitionKey']}) cardinality: about {summary['PartitionKeyCardinality']}")
+        print(f"  - consumed: {summary['ConsumedReadCapacityUnits']} RCU in {summary['Seconds']} s")
+        print("[Output File]")
+        print(f"  - {scan_stats_file_path}")
+        print("Done.")
+    elif args.all and store is not None:
+        #---- describe all the tables and record them in the snapshot store ---------------------#
+        print("Loading the DynamoDB tables...")
+        tables = describe_all_tables(dynamodb, args.output_dir, args.workers, store, args.profile)
+        errors = [table for table in tables if table["Status"] == "error"]
+        removed = []
+        if not errors:    # forget the deleted tables only when the listing is complete
+            removed = store.remove_missing(args.profile, dynamodb.meta.region_name, [table["TableName"] for table in tables])
+        store.save()
+        print("------------------------------------------------------------")
+        print_snapshot_changes(tables, removed)
+        print("[Output File]")
+        print(f"  - {store.index_path}")
+        print(f"  - {store.changes_path}")
+        for table in errors:
+            print(f"  ! {table['TableName']}: {table['Error']}")
+        print("Done.")
+    elif args.all:
+        #---- describe all the tables and save one file per table + index -----------------------#
+        print("Loading the DynamoDB tables...")
+        tables = describe_all_tables(dynamodb, args.output_dir, args.workers)
+        index = {
+          "Profile": args.profile,
+          "Region": dynamodb.meta.region_name,
+          "GeneratedAt": datetime.now(timezone.utc).isoformat(),
+          "Tables": tables,
+        }
+        index_file_path = os.path.join(args.output_dir, "index.json")
+        save_result(index_file_path, index)
+        errors = [table for table in tables if table["Status"] == "error"]
+        print("------------------------------------------------------------")
+        print("[Output File]")
+        print(f"  - {index_file_path}")
+        print(f"  - {len(tables) - len(errors)} table file(s) in {args.output_dir}")
+        for table in errors:
+            print(f"  ! {table['TableName']}: {table['Error']}")
+        print("Done.")
+    else:
+        #---- get DynamoDB table configuration -------------------------------------------------------#
+        print("Loading the DynamoDB table...")
+        response = dynamodb.describe_table(TableName = args.table)    # type: dict
+        #item_number = response.get("Table").get("ItemCount")
+        #print(f"ItemCount: {item_number}")
+
+        #---- save a result file (.json), or record it in the snapshot store (unchanged: no write) ---#
+        if store is None:
+            save_result(result_file_path, response)
+        print("------------------------------------------------------------")
+        if store is not None:
+            response["Table"]["TimeToLiveDescription"] = dynamodb.describe_time_to_live(TableName = args.table)["TimeToLiveDescription"]
+            status, changes = store.record(args.profile, dynamodb.meta.region_name, args.table, response["Table"])
+            if status != "unchanged":
+                store.save()
+            print_snapshot_changes([{"TableName": args.table, "Snapshot": status, "Changes": changes}])
+        print("[Output File]")
+        if store is None:
+            print(f"  - {result_file_path}")
+        else:
+            print(f"  - {store.index_path}")
+        print("Done.")
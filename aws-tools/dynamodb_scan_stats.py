@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+- Module Name: dynamodb_scan_stats.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Item statistics of a DynamoDB table for describe_dynamodb_table.py --scan_stats.
+    The table is read by a parallel Scan (Segment/TotalSegments), one segment per
+    worker thread sharing one client, and the consumed read capacity of all the
+    segments is kept under an RCU budget (per second). Each request reserves the
+    estimated capacity of its page before it is sent (the first page of a segment
+    from TableSizeBytes, then the cost of the previous page), and the difference
+    is settled when the page is read, so the segments do not all start at once.
+  - The statistics are streaming aggregates in constant memory:
+    - number of items, total/max item size and a size histogram (powers of 2)
+    - attribute presence (number of items that have each attribute)
+    - cardinality estimate of the partition key (HyperLogLog)
+  - Item sizes follow the rules of DynamoDB (attribute names + values), so they are
+    close to, but not exactly, the sizes used for billing.
+"""
+import hashlib
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+histogram_min_bytes = 64              # first bucket: <= 64 B
+histogram_max_bytes = 512 * 1024      # last bucket: <= 512 KiB (items are at most 400 KB)
+max_attributes = 1000                 # distinct attribute names counted one by one
+scan_page_bytes = 1024 * 1024         # a Scan page reads at most 1 MB
+units_per_4kb = 0.5                   # eventually consistent read: 0.5 RCU per 4 KB
+
+class HyperLogLog:
+    """Cardinality estimator with 2**precision one-byte registers (precision 14: 16 KiB, about 0.8% error)."""
+
+    def __init__(self, precision = 14):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        #---- value: bytes ----#
+        hashed = int.from_bytes(hashlib.blake2b(value, digest_size = 8).digest(), "big")
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1    # position of the first 1 bit
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        registers_number = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / registers_number)
+        estimate = alpha * registers_number ** 2 / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * registers_number and zeros:    # small range: linear counting
+            estimate = registers_number * math.log(registers_number / zeros)
+        return round(estimate)
+
+def attribute_value_size(value):
+    #---- value: low-level AttributeValue, e.g. {"S": "abc"} ----#
+    (value_type, data), = value.items()
+    if value_type == "S":
+        return len(data.encode())
+    if value_type == "N":
+        digits = data.lstrip("-").replace(".", "").strip("0") or "0"
+        return (len(digits) + 1) // 2 + 1
+    if value_type == "B":
+        return len(data)
+    if value_type in ("BOOL", "NULL"):
+        return 1
+    if value_type == "SS":
+        return sum(len(item.encode()) for item in data)
+    if value_type == "NS":
+        return sum(attribute_value_size({"N": item}) for item in data)
+    if value_type == "BS":
+        return sum(len(item) for item in data)
+    if value_type == "L":
+        return 3 + sum(1 + attribute_value_size(item) for item in data)
+    if value_type == "M":
+        return 3 + sum(1 + len(name.encode()) + attribute_value_size(item) for name, item in data.items())
+    return 0
+
+def item_size(item):
+    return sum(len(name.encode()) + attribute_value_size(value) for name, value in item.items())
+
+def key_bytes(value):
+    #---- AttributeValue of a key -> bytes for HyperLogLog (the type is a part of the key) ----#
+    (value_type, data), = value.items()
+    return value_type.encode() + b":" + (data if isinstance(data, bytes) else str(data).encode())
+
+class ScanStatistics:
+    def __init__(self, partition_key = None):
+        self.partition_key = partition_key
+        self.items_number = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+        self.histogram = [0] * (int(math.log2(histogram_max_bytes // histogram_min_bytes)) + 1)
+        self.attributes = {}    # attribute name -> number of items
+        self.other_attributes = 0    # presences of the names beyond max_attributes
+        self.partition_keys = HyperLogLog()
+        self.consumed_capacity = 0.0
+
+    def add(self, item):
+        size = item_size(item)
+        self.items_number += 1
+        self.total_bytes += size
+        self.max_bytes = max(self.max_bytes, size)
+        bucket = max(0, math.ceil(math.log2(max(size, 1) / histogram_min_bytes)))
+        self.histogram[min(bucket, len(self.histogram) - 1)] += 1
+        for name in item:
+            if name in self.attributes:
+                self.attributes[name] += 1
+            elif len(self.attributes) < max_attributes:
+                self.attributes[name] = 1
+            else:
+                self.other_attributes += 1
+        if self.partition_key in item:
+            self.partition_keys.add(key_bytes(item[self.partition_key]))
+
+    def merge(self, other):
+        self.items_number += other.items_number
+        self.total_bytes += other.total_bytes
+        self.max_bytes = max(self.max_bytes, other.max_bytes)
+        self.histogram = [count + other_count for count, other_count in zip(self.histogram, other.histogram)]
+        for name, count in other.attributes.items():
+            if name in self.attributes or len(self.attributes) < max_attributes:
+                self.attributes[name] = self.attributes.get(name, 0) + count
+            else:
+                self.other_attributes += count
+        self.other_attributes += other.other_attributes
+        self.partition_keys.merge(other.partition_keys)
+        self.consumed_capacity += other.consumed_capacity
+
+    def summary(self):
+        histogram = {f"<={histogram_min_bytes << bucket}B": count for bucket, count in enumerate(self.histogram)}
+        attributes = {name: {"Items": count, "Ratio": round(count / self.items_number, 4)} for name, count in sorted(self.attributes.items(), key = lambda item: -item[1])}
+        return {
+          "ItemCount": self.items_number,
+          "TotalItemBytes": self.total_bytes,
+          "AverageItemBytes": round(self.total_bytes / self.items_number, 1) if self.items_number else 0,
+          "MaxItemBytes": self.max_bytes,
+          "ItemSizeHistogram": histogram,
+          "AttributePresence": attributes,
+          "OtherAttributePresences": self.other_attributes,
+          "PartitionKey": self.partition_key,
+          "PartitionKeyCardinality": self.partition_keys.count(),
+          "ConsumedReadCapacityUnits": round(self.consumed_capacity, 1),
+        }
+
+class CapacityBudget:
+    """Keep the read capacity consumed by all the segments under `units_per_second` (<= 0: no limit)."""
+
+    def __init__(self, units_per_second):
+        self.units_per_second = units_per_second
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self, estimated_units):
+        #---- reserve the estimated capacity of the next page, so concurrent requests (e.g. the first page of each segment) are spaced too ----#
+        if self.units_per_second <= 0:
+            return
+        with self.lock:
+            start_time = max(self.next_time, time.monotonic())
+            self.next_time = start_time + estimated_units / self.units_per_second
+        delay = start_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def consume(self, units, estimated_units):
+        #---- the capacity of a page is known after it is read: settle the difference from the reservation ----#
+        if self.units_per_second <= 0:
+            return
+        with self.lock:
+            self.next_time += (units - estimated_units) / self.units_per_second
+
+def page_units_estimate(table_size_bytes, segments):
+    #---- capacity of the first page of a segment: min(1 MB, size of the segment), from TableSizeBytes (updated about every 6 hours) ----#
+    page_bytes = min(scan_page_bytes, table_size_bytes / max(segments, 1))
+    return max(units_per_4kb, math.ceil(page_bytes / 4096) * units_per_4kb)
+
+def scan_segment(dynamodb, table, segment, total_segments, budget, partition_key, max_items = 0, estimated_units = units_per_4kb):
+    stats = ScanStatistics(partition_key)
+    parameters = {"TableName": table, "Segment": segment, "TotalSegments": total_segments, "ReturnConsumedCapacity": "TOTAL"}
+    while True:
+        if max_items > 0:
+            parameters["Limit"] = max_items - stats.items_number    # do not read more than the sample
+        budget.wait(estimated_units)
+        page = dynamodb.scan(**parameters)
+        for item in page.get("Items", []):
+            stats.add(item)
+        units = page.get("ConsumedCapacity", {}).get("CapacityUnits", 0.0)
+        stats.consumed_capacity += units
+        budget.consume(units, estimated_units)
+        estimated_units = units    # the next page is likely to cost about the same
+        if "LastEvaluatedKey" not in page or (max_items > 0 and stats.items_number >= max_items):
+            return stats
+        parameters["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+def scan_table_statistics(dynamodb, table, segments = 8, units_per_second = 100.0, max_items = 0):
+    """Scan `table` with `segments` parallel segments and return the merged ScanStatistics.
+    With max_items > 0, each segment stops after about max_items / segments items (a sample)."""
+    description = dynamodb.describe_table(TableName = table)["Table"]
+    key_schema = description["KeySchema"]
+    partition_key = next(key["AttributeName"] for key in key_schema if key["KeyType"] == "HASH")
+    budget = CapacityBudget(units_per_second)
+    segment_max_items = -(-max_items // segments) if max_items > 0 else 0
+    estimated_units = page_units_estimate(description.get("TableSizeBytes", scan_page_bytes * segments), segments)
+    with ThreadPoolExecutor(max_workers = segments) as executor:
+        futures = [executor.submit(scan_segment, dynamodb, table, segment, segments, budget, partition_key, segment_max_items, estimated_units) for segment in range(segments)]
+        stats = ScanStatistics(partition_key)
+        for future in futures:
+            stats.merge(future.result())
+    return stats
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+- Module Name: dynamodb_snapshot_store.py
+- Author: @k0j1r0n0
+- Date: October 18, 2026
+- Description
+  - Snapshot store of DynamoDB table descriptions for describe_dynamodb_table.py --snapshot.
+    Each description is normalized (volatile fields such as ItemCount and TableSizeBytes
+    removed, named lists sorted by name) and hashed. The hashes are kept in an index,
+    so an unchanged table costs no file I/O; only new or changed tables are written.
+  - For a changed table, a compact structured diff (path, old value, new value) is
+    appended to a log, e.g.
+      {"Path": "GlobalSecondaryIndexes[gsi1].ProvisionedThroughput.ReadCapacityUnits", "Old": 5, "New": 10}
+  - Files are as follows:
+    - ./results/snapshots/index.json
+    - ./results/snapshots/{profile}/{region}/{table}.json
+    - ./results/snapshots/changes.jsonl
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime, timezone
+
+snapshot_dir_path = "./results/snapshots"
+volatile_fields = {"ItemCount", "TableSizeBytes", "IndexSizeBytes", "NumberOfDecreasesToday"}
+named_lists = {    # list -> key of its items (compared by name, not by position)
+  "AttributeDefinitions": "AttributeName",
+  "GlobalSecondaryIndexes": "IndexName",
+  "LocalSecondaryIndexes": "IndexName",
+  "Replicas": "RegionName",
+  "ReplicaGlobalSecondaryIndexSettings": "IndexName",
+}
+
+def normalize(value, field = None):
+    #---- drop volatile fields, sort named lists, datetime/date -> isoformat ----#
+    if isinstance(value, dict):
+        return {key: normalize(item, key) for key, item in sorted(value.items()) if key not in volatile_fields}
+    if isinstance(value, list):
+        items = [normalize(item) for item in value]
+        if field in named_lists:
+            items.sort(key = lambda item: str(item.get(named_lists[field], "")))
+        return items
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def description_hash(description):
+    text = json.dumps(description, sort_keys = True, separators = (",", ":"), ensure_ascii = False)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def diff(old, new, path = "", field = None):
+    """Return [{"Path", "Old", "New"}] of the leaves that differ (None for a missing side)."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in sorted(set(old) | set(new)):
+            changes += diff(old.get(key), new.get(key), f"{path}.{key}" if path else key, key)
+        return changes
+    if isinstance(old, list) and isinstance(new, list) and field in named_lists:
+        name = named_lists[field]
+        old_items = {item.get(name): item for item in old}
+        new_items = {item.get(name): item for item in new}
+        changes = []
+        for item_name in sorted(set(old_items) | set(new_items), key = str):
+            changes += diff(old_items.get(item_name), new_items.get(item_name), f"{path}[{item_name}]")
+        return changes
+    if old != new:
+        return [{"Path": path, "Old": old, "New": new}]
+    return []
+
+class SnapshotStore:
+    def __init__(self, directory = snapshot_dir_path):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.changes_path = os.path.join(directory, "changes.jsonl")
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok = True)
+        self.index = {}    # "{profile}/{region}/{table}" -> {"Hash", "RecordedAt"}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as file:
+                self.index = json.load(file)
+        self.recorded_at = datetime.now(timezone.utc).isoformat()
+
+    def snapshot_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def record(self, profile, region, table, description):
+        """Store the description of a table if it is new or changed.
+        Return ("new" | "changed" | "unchanged", [changes])."""
+        key = f"{profile}/{region}/{table}"
+        normalized = normalize(description)
+        digest = description_hash(normalized)
+        with self.lock:
+            entry = self.index.get(key)
+        if entry is not None and entry["Hash"] == digest:
+            return "unchanged", []
+
+        snapshot_path = self.snapshot_path(key)
+        changes = []
+        if entry is not None and os.path.exists(snapshot_path):
+            with open(snapshot_path) as file:
+                changes = diff(json.load(file), normalized)
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok = True)
+        with open(snapshot_path + ".tmp", "w") as file:
+            json.dump(normalized, fp = file, indent = 4, ensure_ascii = False)
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+        status = "new" if entry is None else "changed"
+        with self.lock:
+            self.index[key] = {"Hash": digest, "RecordedAt": self.recorded_at}
+            self.log({"Time": self.recorded_at, "Profile": profile, "Region": region, "TableName": table, "Status": status, "Changes": changes})
+        return status, changes
+
+    def remove_missing(self, profile, region, tables):
+        """Forget the tables of (profile, region) that are not in `tables` (a complete listing).
+        Return the names of the removed tables."""
+        prefix = f"{profile}/{region}/"
+        seen = {prefix + table for table in tables}
+        removed = []
+        with self.lock:
+            for key in [key for key in self.index if key.startswith(prefix) and key not in seen]:
+                del self.index[key]
+                if os.path.exists(self.snapshot_path(key)):
+                    os.remove(self.snapshot_path(key))
+                table = key[len(prefix):]
+                self.log({"Time": self.recorded_at, "Profile": profile, "Region": region, "TableName": table, "Status": "removed", "Changes": []})
+                removed.append(table)
+        return removed
+
+    def log(self, record):
+        with open(self.changes_path, "a") as file:
+            file.write(json.dumps(record, ensure_ascii = False) + "\n")
+
+    def save(self):
+        with self.lock, open(self.index_path + ".tmp", "w") as file:
+            json.dump(self.index, fp = file, indent = 4, sort_keys = True)
+        os.replace(self.index_path + ".tmp", self.index_path)